@@ -0,0 +1,47 @@
+import hashlib
+import pickle
+
+from django.conf import settings
+from django.core.cache import cache
+from foodgram.cache import LocalLRUCache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+_local_cache = LocalLRUCache(
+    settings.TOKEN_CACHE_LRU_SIZE, settings.TOKEN_CACHE_LRU_TIMEOUT
+)
+
+
+def _cache_key(key):
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    cache_key = _cache_key(key)
+    _local_cache.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def invalidate_user_tokens(user_ids):
+    for key in Token.objects.filter(user_id__in=user_ids).values_list(
+            'key', flat=True):
+        invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        if not settings.TOKEN_CACHE_TIMEOUT:
+            return super().authenticate_credentials(key)
+        cache_key = _cache_key(key)
+        credentials = _local_cache.get(cache_key)
+        if credentials is None:
+            credentials = cache.get(cache_key)
+            if credentials is None:
+                credentials = pickle.dumps(
+                    super().authenticate_credentials(key)
+                )
+                cache.set(
+                    cache_key, credentials, settings.TOKEN_CACHE_TIMEOUT
+                )
+            _local_cache.set(cache_key, credentials)
+        return pickle.loads(credentials)
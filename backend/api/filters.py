@@ -1,6 +1,11 @@
 import django_filters
 from django_filters import rest_framework as filters
 from recipes.models import Recipe
+from recipes.services import get_tag_catalog
+
+
+def tag_choices():
+    return [(tag['slug'], tag['name']) for tag in get_tag_catalog()]
 
 
 class RecipeFilter(django_filters.FilterSet):
@@ -8,11 +13,17 @@ class RecipeFilter(django_filters.FilterSet):
     is_in_shopping_cart = django_filters.NumberFilter(
         method='filter_is_in_shopping_cart',
     )
-    tags = filters.AllValuesMultipleFilter(field_name='tags__slug')
+    tags = filters.MultipleChoiceFilter(
+        field_name='tags__slug', choices=tag_choices)
+    max_calories = django_filters.NumberFilter(
+        field_name='calories', lookup_expr='lte')
 
     class Meta:
         model = Recipe
-        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags')
+        fields = (
+            'is_favorited', 'is_in_shopping_cart', 'author', 'tags',
+            'max_calories'
+        )
 
     def filter_is_favorited(self, recipes_queryset, name, value):
         if self.request.user.is_anonymous:
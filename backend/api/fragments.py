@@ -0,0 +1,49 @@
+import threading
+
+from django.db import transaction
+from django.db.models import Prefetch
+from recipes.models import IngredientAmount, Recipe
+
+from .response_cache import invalidate_response_cache
+from .serializers import RecipeFragmentSerializer
+
+_pending = threading.local()
+
+
+def render_recipe_fragment(recipe):
+    return RecipeFragmentSerializer(recipe).data
+
+
+def refresh_recipe_fragments(recipes):
+    recipes = list(
+        recipes
+        .select_related('author')
+        .prefetch_related(
+            Prefetch(
+                'recipe_amounts',
+                queryset=IngredientAmount.objects.select_related('ingredient')
+            ),
+            'tags',
+        )
+    )
+    for recipe in recipes:
+        recipe.fragment = render_recipe_fragment(recipe)
+    Recipe.objects.bulk_update(recipes, ['fragment'], batch_size=500)
+    if recipes:
+        invalidate_response_cache()
+    return len(recipes)
+
+
+def _refresh_pending():
+    recipe_ids = getattr(_pending, 'recipe_ids', None)
+    if not recipe_ids:
+        return
+    _pending.recipe_ids = set()
+    refresh_recipe_fragments(Recipe.objects.filter(id__in=recipe_ids))
+
+
+def schedule_fragment_refresh(recipe_ids):
+    if not hasattr(_pending, 'recipe_ids'):
+        _pending.recipe_ids = set()
+    _pending.recipe_ids.update(recipe_ids)
+    transaction.on_commit(_refresh_pending)
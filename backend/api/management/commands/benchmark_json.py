@@ -0,0 +1,95 @@
+import io
+import json
+import timeit
+from pathlib import Path
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer, orjson
+from api.serializers import IngredientSerializer, RecipeSerializer
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from recipes.models import Ingredient, Recipe
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+DEFAULT_INGREDIENTS_FILE = (
+    Path(settings.BASE_DIR).parent / 'data' / 'ingredients.json'
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнение скорости JSON-рендерера и парсера API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=6)
+        parser.add_argument(
+            '--ingredients-file',
+            type=str,
+            default=str(DEFAULT_INGREDIENTS_FILE),
+            help='Каталог продуктов, если в базе он пуст'
+        )
+
+    def get_ingredients_payload(self, filename):
+        ingredients = Ingredient.objects.all()
+        if not ingredients.exists():
+            with open(filename, encoding='utf-8') as f:
+                ingredients = [
+                    Ingredient(id=index, **item)
+                    for index, item in enumerate(json.load(f), start=1)
+                ]
+        return IngredientSerializer(ingredients, many=True).data
+
+    def get_recipes_payload(self, page_size):
+        request = APIRequestFactory().get('/api/recipes/')
+        request.user = AnonymousUser()
+        recipes = Recipe.objects.all()[:page_size]
+        return {
+            'count': Recipe.objects.count(),
+            'next': None,
+            'previous': None,
+            'results': RecipeSerializer(
+                recipes, many=True, context={'request': request}
+            ).data,
+        }
+
+    def measure(self, func, repeat):
+        return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson не установлен')
+        repeat = options['repeat']
+        payloads = {
+            'ingredients': self.get_ingredients_payload(
+                options['ingredients_file']),
+            'recipes': self.get_recipes_payload(options['page_size']),
+        }
+        default_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        default_parser, fast_parser = JSONParser(), ORJSONParser()
+        for name, data in payloads.items():
+            body = default_renderer.render(data)
+            if json.loads(fast_renderer.render(data)) != json.loads(body):
+                raise CommandError(f'Результаты рендеринга {name} различны')
+            rows = (
+                ('render', default_renderer.render, fast_renderer.render,
+                 data),
+                ('parse', self.parse(default_parser), self.parse(fast_parser),
+                 body),
+            )
+            for operation, default, fast, argument in rows:
+                default_time = self.measure(lambda: default(argument), repeat)
+                fast_time = self.measure(lambda: fast(argument), repeat)
+                self.stdout.write(
+                    f'{name:<12} {operation:<7} {len(body):>9} байт  '
+                    f'json: {default_time * 1000:8.3f} мс  '
+                    f'orjson: {fast_time * 1000:8.3f} мс  '
+                    f'x{default_time / fast_time:.1f}'
+                )
+
+    def parse(self, parser):
+        def parse_body(body):
+            return parser.parse(io.BytesIO(body))
+        return parse_body
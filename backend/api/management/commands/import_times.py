@@ -0,0 +1,90 @@
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_SCRIPT = '''
+import importlib
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import django
+django.setup()
+importlib.import_module(sys.argv[1])
+print(time.perf_counter() - start,
+      resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def parse_import_times(output):
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+def get_project_packages():
+    return {
+        path.name for path in Path(settings.BASE_DIR).iterdir()
+        if (path / '__init__.py').exists()
+    }
+
+
+class Command(BaseCommand):
+    help = 'Время импорта модулей при запуске воркера'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            type=str,
+            default='foodgram.wsgi',
+            help='Модуль, импортируемый после django.setup()'
+        )
+        parser.add_argument('--limit', type=int, default=15)
+
+    def handle(self, *args, **options):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT,
+             options['module']],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+        )
+        if process.returncode:
+            raise CommandError(process.stderr)
+        boot_time, max_rss = process.stdout.split()[-2:]
+        modules = parse_import_times(process.stderr)
+        project = get_project_packages()
+        limit = options['limit']
+
+        self.stdout.write(
+            f'Запуск: {float(boot_time) * 1000:.0f} мс, '
+            f'модулей {len(modules)}, '
+            f'пиковая память {int(max_rss) / 1024:.1f} МБ'
+        )
+        self.stdout.write('\nМодули проекта (с учётом зависимостей):')
+        own_modules = sorted(
+            (module for module in modules
+             if module[0].split('.')[0] in project),
+            key=lambda module: module[2], reverse=True
+        )
+        for name, own, cumulative in own_modules[:limit]:
+            self.stdout.write(
+                f'{cumulative / 1000:9.1f} мс  {own / 1000:7.1f} мс  {name}')
+
+        packages = defaultdict(int)
+        for name, own, _ in modules:
+            packages[name.split('.')[0]] += own
+        self.stdout.write('\nПакеты (собственное время модулей):')
+        for name, own in sorted(
+                packages.items(), key=lambda item: item[1],
+                reverse=True)[:limit]:
+            self.stdout.write(f'{own / 1000:9.1f} мс  {name}')
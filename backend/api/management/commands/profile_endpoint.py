@@ -0,0 +1,174 @@
+import json
+import statistics
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from api.response_cache import bump_generation
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from foodgram.profiling import StackSampler
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Профилирование запроса к API с выводом flame graph и SQL-планов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('method', type=str.upper)
+        parser.add_argument('path', type=str)
+        parser.add_argument(
+            '--user', type=str, help='Email или username пользователя')
+        parser.add_argument(
+            '--data', type=str, help='Тело запроса в формате JSON')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--interval', type=float, default=0.001,
+            help='Интервал сэмплирования стека в секундах'
+        )
+        parser.add_argument(
+            '--output', type=str, default='profile.folded',
+            help='Файл со свёрнутыми стеками для flamegraph.pl или speedscope'
+        )
+        parser.add_argument(
+            '--host', type=str, help='Значение заголовка Host')
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Сбрасывать кэш ответов перед каждым запросом'
+        )
+        parser.add_argument(
+            '--explain', type=int, default=3,
+            help='Количество самых медленных запросов для EXPLAIN'
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Выполнять EXPLAIN ANALYZE (только PostgreSQL)'
+        )
+
+    def get_client(self, username, host):
+        client = APIClient(HTTP_HOST=host or settings.CACHE_WARM_HOST)
+        if username:
+            user = User.objects.filter(
+                Q(email=username) | Q(username=username)).first()
+            if user is None:
+                raise CommandError(f'Пользователь {username} не найден')
+            client.force_authenticate(user)
+        return client
+
+    def send(self, client, options):
+        try:
+            with transaction.atomic():
+                response = client.generic(
+                    options['method'], options['path'], options['data'] or '',
+                    content_type='application/json'
+                )
+                raise Rollback
+        except Rollback:
+            pass
+        return response
+
+    def profile(self, client, options):
+        durations = []
+        with ExitStack() as stack:
+            captured = [
+                stack.enter_context(CaptureQueriesContext(connection))
+                for connection in connections.all()
+            ]
+            with StackSampler(options['interval']) as sampler:
+                for _ in range(options['repeat']):
+                    if options['cold']:
+                        bump_generation()
+                    start = time.perf_counter()
+                    response = self.send(client, options)
+                    durations.append(time.perf_counter() - start)
+        return response, durations, sampler, captured
+
+    def get_statements(self, captured):
+        statements = defaultdict(lambda: {'calls': 0, 'time': 0.0})
+        for context in captured:
+            for query in context.captured_queries:
+                statement = statements[(context.connection.alias,
+                                        query['sql'])]
+                statement['calls'] += 1
+                statement['time'] += float(query['time'])
+        return sorted(
+            statements.items(),
+            key=lambda item: (item[1]['time'], item[1]['calls']),
+            reverse=True
+        )
+
+    def explain(self, alias, sql, analyze):
+        connection = connections[alias]
+        options = {'analyze': True} if analyze else {}
+        try:
+            prefix = connection.ops.explain_query_prefix(**options)
+        except ValueError as error:
+            raise CommandError(error)
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}')
+            return '\n'.join(
+                ' '.join(str(column) for column in row)
+                for row in cursor.fetchall()
+            )
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        if repeat < 1:
+            raise CommandError('--repeat должен быть больше нуля')
+        if options['data']:
+            try:
+                json.loads(options['data'])
+            except json.JSONDecodeError as error:
+                raise CommandError(f'Некорректный JSON в --data: {error}')
+        client = self.get_client(options['user'], options['host'])
+        response, durations, sampler, captured = self.profile(
+            client, options)
+
+        self.stdout.write(
+            f'{options["method"]} {options["path"]} -> '
+            f'{response.status_code}, {len(response.content)} байт'
+        )
+        self.stdout.write(
+            f'Время: мин {min(durations) * 1000:.2f} мс, '
+            f'медиана {statistics.median(durations) * 1000:.2f} мс, '
+            f'повторов {repeat}'
+        )
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            sampler.write_collapsed(f)
+        self.stdout.write(
+            f'Сэмплов: {sampler.samples}, стеки записаны в {options["output"]}'
+        )
+        for frame, count in sampler.hottest(15):
+            self.stdout.write(
+                f'{count / sampler.samples * 100:6.1f}%  {frame}')
+
+        statements = self.get_statements(captured)
+        total = sum(statement['calls'] for _, statement in statements)
+        self.stdout.write(
+            f'\nSQL: {total / repeat:.1f} запросов на запрос, '
+            f'уникальных {len(statements)}'
+        )
+        for (alias, sql), statement in statements[:20]:
+            self.stdout.write(
+                f'{statement["time"] / repeat * 1000:8.2f} мс  '
+                f'{statement["calls"] / repeat:5.1f}x  [{alias}] {sql[:200]}'
+            )
+
+        slowest = [
+            (alias, sql) for (alias, sql), _ in statements
+            if sql.lstrip().upper().startswith('SELECT')
+        ][:options['explain']]
+        for alias, sql in slowest:
+            self.stdout.write(f'\n[{alias}] {sql}')
+            self.stdout.write(self.explain(alias, sql, options['analyze']))
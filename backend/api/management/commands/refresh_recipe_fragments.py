@@ -0,0 +1,31 @@
+from api.fragments import refresh_recipe_fragments
+from django.core.management.base import BaseCommand
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Пересборка готовых JSON-представлений рецептов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Только рецепты без готового представления'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.order_by('id')
+        if options['missing']:
+            recipes = recipes.filter(fragment__isnull=True)
+        recipe_ids = list(recipes.values_list('id', flat=True))
+        batch_size = options['batch_size']
+        total = 0
+        for start in range(0, len(recipe_ids), batch_size):
+            total += refresh_recipe_fragments(
+                Recipe.objects.filter(
+                    id__in=recipe_ids[start:start + batch_size])
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено представлений: {total}')
+        )
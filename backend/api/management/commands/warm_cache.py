@@ -0,0 +1,43 @@
+from api.response_cache import is_response_cache_shared, warm_response_cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Прогрев кэша ответов API для рецептов и справочников'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            help='Количество страниц списка рецептов для каждого набора тегов'
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            help='Пауза между запросами в секундах'
+        )
+        parser.add_argument(
+            '--host',
+            type=str,
+            help='Значение заголовка Host для ссылок в ответах'
+        )
+
+    def handle(self, *args, **options):
+        if not is_response_cache_shared():
+            self.stderr.write(self.style.WARNING(
+                'Кэш ответов отключён или хранится в памяти процесса, '
+                'прогрев пропущен'
+            ))
+            return
+        try:
+            warmed = warm_response_cache(
+                options['pages'], options['delay'], options['host']
+            )
+        except ImproperlyConfigured as error:
+            raise CommandError(error)
+        for url, status_code in warmed:
+            self.stdout.write(f'{status_code} {url}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Прогрето адресов: {len(warmed)}')
+        )
@@ -0,0 +1,74 @@
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from recipes.models import Favorite, ShoppingCart, Subscribe
+
+RELATIONS = {
+    'favorites': (Favorite, 'user', 'recipe_id'),
+    'shopping_cart': (ShoppingCart, 'user', 'recipe_id'),
+    'subscriptions': (Subscribe, 'follower', 'following_id'),
+}
+
+
+def _cache_key(user_id, name):
+    return f'relations:{name}:{user_id}'
+
+
+def invalidate_user_relations(user_id, name):
+    cache.delete(_cache_key(user_id, name))
+
+
+def invalidate_model_relations(model, user_ids):
+    cache.delete_many([
+        _cache_key(user_id, name)
+        for name, (relation_model, _, _) in RELATIONS.items()
+        if relation_model is model
+        for user_id in user_ids
+    ])
+
+
+class UserRelations:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._sets = {}
+
+    def load(self, name):
+        key = _cache_key(self.user_id, name)
+        ids = cache.get(key) if settings.USER_RELATIONS_CACHE_TIMEOUT else None
+        if ids is None:
+            model, user_field, id_field = RELATIONS[name]
+            ids = array('q', sorted(
+                model.objects
+                .filter(**{user_field: self.user_id})
+                .values_list(id_field, flat=True)
+            )).tobytes()
+            if settings.USER_RELATIONS_CACHE_TIMEOUT:
+                cache.set(key, ids, settings.USER_RELATIONS_CACHE_TIMEOUT)
+        return frozenset(array('q', ids))
+
+    def get(self, name):
+        if name not in self._sets:
+            self._sets[name] = self.load(name)
+        return self._sets[name]
+
+    @property
+    def favorite_ids(self):
+        return self.get('favorites')
+
+    @property
+    def shopping_cart_ids(self):
+        return self.get('shopping_cart')
+
+    @property
+    def subscription_ids(self):
+        return self.get('subscriptions')
+
+
+def get_user_relations(request):
+    if request is None or not request.user or request.user.is_anonymous:
+        return None
+    relations = getattr(request, 'user_relations', None)
+    if relations is None or relations.user_id != request.user.id:
+        relations = request.user_relations = UserRelations(request.user.id)
+    return relations
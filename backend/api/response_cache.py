@@ -0,0 +1,139 @@
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import DisallowedHost, ImproperlyConfigured
+from django.db import transaction
+from django.urls import resolve
+from foodgram.singleflight import single_flight
+from jobs.models import Job
+from jobs.registry import enqueue
+from recipes.services import get_popular_tag_filters, get_tag_catalog
+from rest_framework.response import Response
+
+from .paginations import PageLimitPagination
+
+GENERATION_KEY = 'response-cache:generation'
+
+logger = logging.getLogger(__name__)
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+
+
+def get_cache_key(request):
+    query = urlencode(sorted(
+        (name, value)
+        for name, values in request.GET.lists()
+        for value in values
+    ))
+    return (
+        f'response:{get_generation()}:'
+        f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    )
+
+
+class CachedListMixin:
+    cache_anonymous_only = False
+
+    def is_response_cacheable(self, request):
+        return not (
+            self.cache_anonymous_only and request.user.is_authenticated
+        )
+
+    def get_list_data(self, key, request, *args, **kwargs):
+        data = super().list(request, *args, **kwargs).data
+        if settings.RESPONSE_CACHE_TIMEOUT:
+            cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+        return data
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        key = get_cache_key(request)
+        data = cache.get(key)
+        if data is None:
+            data = single_flight(key, lambda: self.get_list_data(
+                key, request, *args, **kwargs))
+        response = Response(data)
+        response.cache_compressed = True
+        return response
+
+
+def is_response_cache_shared():
+    return settings.SHARED_CACHE and bool(settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def schedule_cache_warm():
+    if not is_response_cache_shared():
+        return
+    pending = Job.objects.filter(name='cache.warm', status=Job.PENDING)
+    if not pending.exists():
+        enqueue('cache.warm', delay=settings.CACHE_WARM_JOB_DELAY)
+
+
+def _invalidate():
+    bump_generation()
+    schedule_cache_warm()
+
+
+def invalidate_response_cache():
+    transaction.on_commit(_invalidate)
+
+
+def get_warm_urls(pages, limit=PageLimitPagination.page_size):
+    slugs = [tag['slug'] for tag in get_tag_catalog()]
+    combinations = [[]]
+    if len(slugs) > 1:
+        combinations.append(slugs)
+    combinations += [
+        tags
+        for tags in get_popular_tag_filters(settings.CACHE_WARM_TAG_FILTERS)
+        if sorted(tags) != sorted(slugs)
+    ]
+    urls = ['/api/tags/', '/api/ingredients/']
+    for tags in combinations:
+        for page in range(1, pages + 1):
+            query = [('page', page), ('limit', limit)]
+            query += [('tags', slug) for slug in tags]
+            urls.append(f'/api/recipes/?{urlencode(query)}')
+    return urls
+
+
+def warm_response_cache(pages=None, delay=None, host=None):
+    from django.test import RequestFactory
+
+    if not is_response_cache_shared():
+        logger.warning('Кэш ответов не общий для процессов, прогрев пропущен')
+        return []
+    pages = settings.CACHE_WARM_PAGES if pages is None else pages
+    delay = settings.CACHE_WARM_DELAY if delay is None else delay
+    host = host or settings.CACHE_WARM_HOST
+    factory = RequestFactory(HTTP_HOST=host)
+    try:
+        factory.get('/').get_host()
+    except DisallowedHost:
+        raise ImproperlyConfigured(
+            f'Хост {host} для прогрева кэша не входит в ALLOWED_HOSTS')
+    warmed = []
+    for url in get_warm_urls(pages):
+        request = factory.get(url)
+        match = resolve(request.path)
+        response = match.func(request, *match.args, **match.kwargs)
+        warmed.append((url, response.status_code))
+        time.sleep(delay)
+    return warmed
@@ -1,17 +1,51 @@
 from collections import Counter
 
+from changes.log import record_queryset
+from changes.models import Change
 from django.contrib.auth import get_user_model
 from djoser.serializers import UserSerializer
 from drf_extra_fields.fields import Base64ImageField
-from recipes.constants import MIN_AMOUNT
-from recipes.models import (Favorite, Ingredient, IngredientAmount, Recipe,
-                            ShoppingCart, Subscribe, Tag, UserProfile)
+from jobs.models import Job
+from recipes.constants import MIN_AMOUNT, MIN_MULTIPLIER
+from recipes.models import (Ingredient, IngredientAmount, MealPlanEntry,
+                            Recipe, Tag, UserProfile)
+from recipes.nutrition import NUTRIENTS, schedule_nutrition_recompute
 from rest_framework import serializers
 
+from .relations import get_user_relations
+
 User = get_user_model()
 
 
-class UserProfileSerializer(UserSerializer):
+def parse_field_names(value):
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_requested_fields(request, field_names):
+    query_params = getattr(request, 'query_params', request.GET)
+    requested = parse_field_names(query_params.get('fields'))
+    omitted = parse_field_names(query_params.get('omit'))
+    return {
+        name for name in field_names
+        if (not requested or name in requested) and name not in omitted
+    }
+
+
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = get_requested_fields(request, self.fields)
+        for name in list(self.fields):
+            if name not in requested:
+                self.fields.pop(name)
+
+
+class UserProfileSerializer(SparseFieldsMixin, UserSerializer):
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
@@ -22,13 +56,21 @@ class UserProfileSerializer(UserSerializer):
         )
 
     def get_is_subscribed(self, user_profile):
-        user = self.context.get('request').user
-        if not user or user.is_anonymous:
+        return self.is_subscribed_to(user_profile.id)
+
+    def is_subscribed_to(self, author_id):
+        relations = get_user_relations(self.context.get('request'))
+        if relations is None:
             return False
-        Subscribe.objects.filter(
-            follower=user,
-            following=user_profile.id
-        ).exists()
+        return author_id in relations.subscription_ids
+
+
+class AuthorFragmentSerializer(UserProfileSerializer):
+    class Meta(UserProfileSerializer.Meta):
+        fields = tuple(
+            field for field in UserProfileSerializer.Meta.fields
+            if field != 'is_subscribed'
+        )
 
 
 class AvatarSerializer(UserProfileSerializer):
@@ -64,7 +106,7 @@ class IngredientAmountSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount')
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
     author = UserProfileSerializer(read_only=True)
@@ -78,6 +120,7 @@ class RecipeSerializer(serializers.ModelSerializer):
         read_only=True,
         many=True,
     )
+    nutrition = serializers.SerializerMethodField()
 
     class Meta:
         fields = (
@@ -91,28 +134,63 @@ class RecipeSerializer(serializers.ModelSerializer):
             'name',
             'is_favorited',
             'is_in_shopping_cart',
+            'nutrition',
         )
 
         read_only_fields = (
             'author',
             'is_favorited',
-            'is_in_shopping_cart'
+            'is_in_shopping_cart',
+            'nutrition',
         )
         model = Recipe
 
-    def get_is_favorited(self, obj):
+    def to_representation(self, recipe):
+        if 'fragment' in recipe.get_deferred_fields() or not recipe.fragment:
+            return super().to_representation(recipe)
         request = self.context.get('request')
-        return Favorite.objects.filter(
-            user=request.user.id,
-            recipe=obj,
-        ).exists()
+        fragment = recipe.fragment
+        computed = {
+            'image': lambda: build_absolute_url(request, fragment['image']),
+            'author': lambda: self.get_author_from_fragment(recipe),
+            'is_favorited': lambda: self.get_is_favorited(recipe),
+            'is_in_shopping_cart': lambda: self.get_is_in_shopping_cart(
+                recipe),
+            'nutrition': lambda: self.get_nutrition(recipe),
+        }
+        return {
+            name: computed[name]() if name in computed else fragment[name]
+            for name in self.fields
+        }
+
+    def get_author_from_fragment(self, recipe):
+        author_field = self.fields['author']
+        author = {
+            **recipe.fragment['author'],
+            'avatar': build_absolute_url(
+                self.context.get('request'),
+                recipe.fragment['author']['avatar']
+            ),
+            'is_subscribed': author_field.is_subscribed_to(recipe.author_id),
+        }
+        return {name: author[name] for name in author_field.fields}
+
+    def get_nutrition(self, obj):
+        if obj.calories is None:
+            return None
+        return {nutrient: getattr(obj, nutrient) for nutrient in NUTRIENTS}
+
+    def get_is_favorited(self, obj):
+        relations = get_user_relations(self.context.get('request'))
+        if relations is None:
+            return False
+        return obj.id in relations.favorite_ids
 
     def get_is_in_shopping_cart(self, obj):
-        request = self.context.get('request')
-        return ShoppingCart.objects.filter(
-            user=request.user.id,
-            recipe=obj,
-        ).exists()
+        relations = get_user_relations(self.context.get('request'))
+        if relations is None:
+            return False
+        return obj.id in relations.shopping_cart_ids
 
     def create_ingredients(self, ingredients, recipe):
         IngredientAmount.objects.bulk_create(
@@ -123,6 +201,9 @@ class RecipeSerializer(serializers.ModelSerializer):
             )
             for ingredient in ingredients
         )
+        record_queryset(
+            IngredientAmount.objects.filter(recipe=recipe), Change.CREATE)
+        schedule_nutrition_recompute([recipe.id])
 
     def validate_field(self, field, model):
         data = self.initial_data.get(field)
@@ -167,10 +248,31 @@ class RecipeSerializer(serializers.ModelSerializer):
         instance.tags.set(tags_data)
         instance.recipe_amounts.all().delete()
         self.create_ingredients(ingredients_data, instance)
+        instance.fragment = None
 
         return super().update(instance, validated_data)
 
 
+class RecipeFragmentSerializer(RecipeSerializer):
+    author = AuthorFragmentSerializer(read_only=True)
+
+    class Meta(RecipeSerializer.Meta):
+        fields = tuple(
+            field for field in RecipeSerializer.Meta.fields
+            if field not in (
+                'is_favorited', 'is_in_shopping_cart', 'nutrition')
+        )
+
+    def to_representation(self, recipe):
+        return super(RecipeSerializer, self).to_representation(recipe)
+
+
+def build_absolute_url(request, url):
+    if request is None or not url:
+        return url
+    return request.build_absolute_uri(url)
+
+
 class SubscribedUserSerializer(UserProfileSerializer):
     recipes = serializers.SerializerMethodField()
     recipes_count = serializers.IntegerField(
@@ -198,3 +300,68 @@ class RecipeShortSerializer(serializers.ModelSerializer):
         model = Recipe
         fields = ('id', 'name', 'image', 'cooking_time')
         read_only_fields = fields
+
+
+class MultiplierSerializer(serializers.Serializer):
+    multiplier = serializers.DecimalField(
+        max_digits=6, decimal_places=2, min_value=MIN_MULTIPLIER, default=1
+    )
+
+
+class DateRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if data.get('start') and data.get('end') and (
+                data['start'] > data['end']):
+            raise serializers.ValidationError(
+                'Начало периода позже его окончания')
+        return data
+
+
+class MealPlanEntrySerializer(serializers.ModelSerializer):
+    recipe = serializers.PrimaryKeyRelatedField(queryset=Recipe.objects.all())
+    multiplier = serializers.DecimalField(
+        max_digits=6, decimal_places=2, min_value=MIN_MULTIPLIER, default=1
+    )
+
+    class Meta:
+        model = MealPlanEntry
+        fields = ('id', 'recipe', 'day', 'multiplier')
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['recipe'] = RecipeShortSerializer(
+            instance.recipe, context=self.context).data
+        return data
+
+
+class ShoppingListItemSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False
+    )
+    measurement_unit = serializers.CharField()
+
+
+class ShoppingListRemovedItemSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    measurement_unit = serializers.CharField()
+
+
+class ShoppingCartSummarySerializer(serializers.Serializer):
+    version = serializers.IntegerField()
+    full = serializers.BooleanField()
+    ingredients = ShoppingListItemSerializer(many=True)
+    removed = ShoppingListRemovedItemSerializer(many=True)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = (
+            'id', 'name', 'status', 'attempts', 'result', 'error',
+            'created_at', 'updated_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,134 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+from recipes.deletion import relations_deleted
+from recipes.models import (Favorite, Ingredient, IngredientAmount, Recipe,
+                            ShoppingCart, Subscribe, Tag)
+from recipes.nutrition import nutrition_updated
+from recipes.services import users_updated
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .fragments import schedule_fragment_refresh
+from .relations import invalidate_model_relations, invalidate_user_relations
+from .response_cache import invalidate_response_cache
+
+User = get_user_model()
+
+AUTHOR_FRAGMENT_FIELDS = {
+    'username', 'first_name', 'last_name', 'email', 'avatar'
+}
+AUTH_CACHE_IGNORED_FIELDS = {'last_login'}
+RECIPE_FRAGMENT_IGNORED_FIELDS = {'fragment', 'deleted_at'}
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+@receiver(nutrition_updated)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate_response_cache()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_responses_on_user_delete(sender, update_fields,
+                                               **kwargs):
+    if update_fields and 'deleted_at' in update_fields:
+        invalidate_response_cache()
+
+
+@receiver(post_save, sender=Recipe)
+def refresh_fragment_on_recipe_change(sender, instance, update_fields,
+                                      **kwargs):
+    if update_fields and set(update_fields) <= RECIPE_FRAGMENT_IGNORED_FIELDS:
+        return
+    schedule_fragment_refresh([instance.pk])
+
+
+@receiver(post_save, sender=IngredientAmount)
+@receiver(post_delete, sender=IngredientAmount)
+def refresh_fragment_on_amount_change(sender, instance, **kwargs):
+    schedule_fragment_refresh([instance.recipe_id])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def refresh_fragment_on_tags_change(sender, instance, action, reverse,
+                                    pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schedule_fragment_refresh([instance.pk])
+    elif pk_set:
+        schedule_fragment_refresh(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def refresh_fragments_on_tag_change(sender, instance, **kwargs):
+    schedule_fragment_refresh(
+        instance.recipes.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(pre_delete, sender=Ingredient)
+def refresh_fragments_on_ingredient_change(sender, instance, **kwargs):
+    schedule_fragment_refresh(
+        instance.recipe_amounts.values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def refresh_fragments_on_author_change(sender, instance, created,
+                                       update_fields, **kwargs):
+    if created:
+        return
+    if update_fields and not AUTHOR_FRAGMENT_FIELDS & set(update_fields):
+        return
+    schedule_fragment_refresh(
+        instance.recipes.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_on_user_change(sender, instance, created,
+                                     update_fields, **kwargs):
+    if created:
+        return
+    if update_fields and set(update_fields) <= AUTH_CACHE_IGNORED_FIELDS:
+        return
+    invalidate_user_tokens([instance.pk])
+
+
+@receiver(users_updated)
+def invalidate_tokens_on_users_update(sender, user_ids, **kwargs):
+    invalidate_user_tokens(user_ids)
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def invalidate_favorites(sender, instance, **kwargs):
+    invalidate_user_relations(instance.user_id, 'favorites')
+
+
+@receiver(post_save, sender=ShoppingCart)
+@receiver(post_delete, sender=ShoppingCart)
+def invalidate_shopping_cart(sender, instance, **kwargs):
+    invalidate_user_relations(instance.user_id, 'shopping_cart')
+
+
+@receiver(post_save, sender=Subscribe)
+@receiver(post_delete, sender=Subscribe)
+def invalidate_subscriptions(sender, instance, **kwargs):
+    invalidate_user_relations(instance.follower_id, 'subscriptions')
+
+
+@receiver(relations_deleted)
+def invalidate_deleted_relations(sender, user_ids, **kwargs):
+    invalidate_model_relations(sender, user_ids)
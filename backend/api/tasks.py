@@ -0,0 +1,8 @@
+from jobs.registry import task
+
+from .response_cache import warm_response_cache
+
+
+@task('cache.warm')
+def warm_cache_task():
+    return {'urls': len(warm_response_cache())}
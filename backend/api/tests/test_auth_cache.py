@@ -0,0 +1,111 @@
+from api.authentication import _cache_key, _local_cache
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from recipes.models import Tag
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+@override_settings(TOKEN_CACHE_TIMEOUT=300)
+class CachedTokenAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user', avatar='users/images/avatar.png')
+        cls.recipe = create_recipe(create_user('author'))
+
+    def setUp(self):
+        cache.clear()
+        _local_cache.clear()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+
+    def test_credentials_are_cached(self):
+        self.assertIsNotNone(cache.get(_cache_key(self.token.key)))
+
+    @override_settings(TOKEN_CACHE_TIMEOUT=0)
+    def test_process_local_cache_disables_token_cache(self):
+        cache.clear()
+        _local_cache.clear()
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+        self.assertIsNone(cache.get(_cache_key(self.token.key)))
+        self.assertIsNone(_local_cache.get(_cache_key(self.token.key)))
+
+    def get_cart_version(self):
+        return User.objects.get(pk=self.user.pk).cart_version
+
+    def test_cart_change_refreshes_cached_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/recipes/{self.recipe.id}/shopping_cart/')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.patch(
+            '/api/users/me/', {'first_name': 'Анна'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_cart_version(), 1)
+
+    def test_avatar_delete_keeps_counters(self):
+        User.objects.filter(pk=self.user.pk).update(
+            cart_version=5, fanout_on_read=True)
+        response = self.client.delete('/api/users/me/avatar/')
+        self.assertEqual(response.status_code, 204)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.cart_version, 5)
+        self.assertTrue(user.fanout_on_read)
+        self.assertFalse(user.avatar)
+
+    def test_deleted_token_is_rejected(self):
+        response = self.client.post('/api/auth/token/logout/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+
+@override_settings(USER_RELATIONS_CACHE_TIMEOUT=300)
+class UserRelationsCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.author = create_user('author')
+        cls.recipe = create_recipe(
+            cls.author, tags=[Tag.objects.create(name='Обед', slug='lunch')])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_recipe(self):
+        return self.client.get(f'/api/recipes/{self.recipe.id}/').data
+
+    def test_recipe_flags_follow_changes(self):
+        recipe = self.get_recipe()
+        self.assertFalse(recipe['is_favorited'])
+        self.assertFalse(recipe['is_in_shopping_cart'])
+        self.client.post(f'/api/recipes/{self.recipe.id}/favorite/')
+        self.client.post(f'/api/recipes/{self.recipe.id}/shopping_cart/')
+        recipe = self.get_recipe()
+        self.assertTrue(recipe['is_favorited'])
+        self.assertTrue(recipe['is_in_shopping_cart'])
+        self.client.delete(f'/api/recipes/{self.recipe.id}/favorite/')
+        self.client.delete(f'/api/recipes/{self.recipe.id}/shopping_cart/')
+        recipe = self.get_recipe()
+        self.assertFalse(recipe['is_favorited'])
+        self.assertFalse(recipe['is_in_shopping_cart'])
+
+    def test_subscription_flag_follows_changes(self):
+        url = f'/api/users/{self.author.id}/'
+        self.assertFalse(self.client.get(url).data['is_subscribed'])
+        self.client.post(f'{url}subscribe/')
+        self.assertTrue(self.client.get(url).data['is_subscribed'])
+        self.client.delete(f'{url}subscribe/')
+        self.assertFalse(self.client.get(url).data['is_subscribed'])
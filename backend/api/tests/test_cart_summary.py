@@ -0,0 +1,138 @@
+import threading
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from recipes import services
+from recipes.models import Ingredient, IngredientAmount, ShoppingCart
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+SUMMARY_URL = '/api/recipes/shopping_cart/summary/'
+
+
+class CartSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        author = create_user('author')
+        cls.flour = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+        cls.sugar = Ingredient.objects.create(
+            name='Сахар', measurement_unit='г')
+        cls.salt = Ingredient.objects.create(
+            name='Соль', measurement_unit='г')
+        cls.bread = create_recipe(
+            author, name='Хлеб',
+            ingredients=[(cls.flour, 500), (cls.salt, 10)])
+        cls.cake = create_recipe(
+            author, name='Пирог',
+            ingredients=[(cls.flour, 300), (cls.sugar, 200)])
+        ShoppingCart.objects.create(user=cls.user, recipe=cls.bread)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_summary(self, since=None):
+        params = {} if since is None else {'since': since}
+        response = self.client.get(SUMMARY_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get_names(self, items):
+        return sorted(item['name'] for item in items)
+
+    def test_since_returns_changed_lines(self):
+        first = self.get_summary()
+        self.assertTrue(first['full'])
+        self.assertEqual(
+            self.get_names(first['ingredients']), ['Мука', 'Соль'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/recipes/{self.cake.id}/shopping_cart/')
+        second = self.get_summary(first['version'])
+        self.assertGreater(second['version'], first['version'])
+        self.assertFalse(second['full'])
+        self.assertEqual(
+            self.get_names(second['ingredients']), ['Мука', 'Сахар'])
+        self.assertEqual(second['removed'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                f'/api/recipes/{self.bread.id}/shopping_cart/')
+        third = self.get_summary(second['version'])
+        self.assertEqual(self.get_names(third['ingredients']), ['Мука'])
+        self.assertEqual(self.get_names(third['removed']), ['Соль'])
+        unchanged = self.get_summary(third['version'])
+        self.assertFalse(unchanged['full'])
+        self.assertEqual(unchanged['ingredients'], [])
+        self.assertEqual(unchanged['removed'], [])
+
+    def test_amount_change_bumps_version(self):
+        first = self.get_summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            amount = IngredientAmount.objects.get(
+                recipe=self.bread, ingredient=self.salt)
+            amount.amount = 20
+            amount.save()
+        second = self.get_summary(first['version'])
+        self.assertEqual(second['version'], first['version'] + 1)
+        self.assertEqual(self.get_names(second['ingredients']), ['Соль'])
+
+    def test_unknown_version_returns_full_summary(self):
+        version = self.get_summary()['version']
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/recipes/{self.cake.id}/shopping_cart/')
+        self.assertTrue(self.get_summary(version)['full'])
+        self.assertTrue(self.get_summary(version + 100)['full'])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get(SUMMARY_URL, {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipUnless(
+    connection.vendor == 'postgresql',
+    'Блокировка строки пользователя есть только в PostgreSQL')
+class CartSummaryConcurrencyTests(TransactionTestCase):
+    def test_concurrent_change_is_not_cached_under_old_version(self):
+        cache.clear()
+        user = create_user('user')
+        author = create_user('author')
+        flour = Ingredient.objects.create(name='Мука', measurement_unit='г')
+        sugar = Ingredient.objects.create(name='Сахар', measurement_unit='г')
+        ShoppingCart.objects.create(
+            user=user,
+            recipe=create_recipe(author, ingredients=[(flour, 500)]))
+        cake = create_recipe(
+            author, name='Пирог', ingredients=[(sugar, 200)])
+        get_items = services.get_shopping_list_items
+        threads = []
+
+        def add_to_cart():
+            try:
+                ShoppingCart.objects.get_or_create(user=user, recipe=cake)
+            finally:
+                connections['default'].close()
+
+        def get_items_during_change(entries):
+            thread = threading.Thread(target=add_to_cart)
+            threads.append(thread)
+            thread.start()
+            thread.join(0.5)
+            return get_items(entries)
+
+        with mock.patch.object(
+                services, 'get_shopping_list_items', get_items_during_change):
+            first = services.get_shopping_cart_summary(user)
+        threads[0].join()
+        self.assertEqual(
+            [item['name'] for item in first['ingredients']], ['Мука'])
+        second = services.get_shopping_cart_summary(user, first['version'])
+        self.assertGreater(second['version'], first['version'])
+        self.assertFalse(second['full'])
+        self.assertEqual(
+            [item['name'] for item in second['ingredients']], ['Сахар'])
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from recipes.models import Subscribe
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.author = create_user('author')
+        cls.recipes = [
+            create_recipe(cls.author, name=f'Рецепт {index}')
+            for index in range(5)
+        ]
+        create_recipe(create_user('stranger'))
+        Subscribe.objects.create(follower=cls.user, following=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_ids(self, response):
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def test_feed_pages_by_before(self):
+        expected = [recipe.id for recipe in reversed(self.recipes)]
+        response = self.client.get('/api/recipes/feed/?limit=3')
+        self.assertEqual(self.get_ids(response), expected[:3])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.get_ids(response), expected[3:])
+        self.assertIsNone(response.data['next'])
+
+    @override_settings(FEED_MAX_PAGE_SIZE=2)
+    def test_limit_is_capped(self):
+        response = self.client.get('/api/recipes/feed/?limit=1000')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.client.get('/api/recipes/feed/?limit=-1')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from recipes.models import Ingredient, Recipe, Tag
+from recipes.tests.factories import create_recipe, create_user
+
+
+class RecipeFragmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author')
+        cls.tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+        cls.ingredient = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+
+    def setUp(self):
+        cache.clear()
+
+    def create_recipe(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe = create_recipe(
+                self.author,
+                ingredients=[(self.ingredient, 200)],
+                tags=[self.tag],
+                **fields
+            )
+        recipe.refresh_from_db()
+        return recipe
+
+    def test_fragment_rendered_on_create(self):
+        recipe = self.create_recipe(name='Блины')
+        self.assertEqual(recipe.fragment['name'], 'Блины')
+        self.assertEqual(recipe.fragment['author']['username'], 'author')
+        self.assertEqual(
+            [tag['slug'] for tag in recipe.fragment['tags']], ['breakfast'])
+        self.assertEqual(
+            recipe.fragment['ingredients'][0]['amount'], 200)
+
+    def test_plain_save_refreshes_fragment(self):
+        recipe = self.create_recipe()
+        recipe.name = 'Оладьи'
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.fragment['name'], 'Оладьи')
+
+    def test_tombstone_save_keeps_fragment(self):
+        recipe = self.create_recipe()
+        Recipe.objects.filter(id=recipe.id).update(fragment={'stale': True})
+        recipe.name = 'Не сохраняется'
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save(update_fields=['deleted_at'])
+        self.assertEqual(
+            Recipe.all_objects.get(id=recipe.id).fragment, {'stale': True})
+
+    def test_related_changes_refresh_fragment(self):
+        recipe = self.create_recipe()
+        lunch = Tag.objects.create(name='Обед', slug='lunch')
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.tags.add(lunch)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ingredient.name = 'Мука пшеничная'
+            self.ingredient.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = 'Анна'
+            self.author.save()
+        recipe.refresh_from_db()
+        self.assertEqual(
+            sorted(tag['slug'] for tag in recipe.fragment['tags']),
+            ['breakfast', 'lunch'])
+        self.assertEqual(
+            recipe.fragment['ingredients'][0]['name'], 'Мука пшеничная')
+        self.assertEqual(recipe.fragment['author']['first_name'], 'Анна')
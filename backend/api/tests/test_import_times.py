@@ -0,0 +1,27 @@
+import io
+
+from api.management.commands.import_times import parse_import_times
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+IMPORT_TIME_OUTPUT = '''\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   recipes.units
+import time:      2500 |      48000 | rest_framework
+'''
+
+
+class ImportTimesTests(SimpleTestCase):
+    def test_parse_import_times(self):
+        self.assertEqual(parse_import_times(IMPORT_TIME_OUTPUT), [
+            ('recipes.units', 120, 120),
+            ('rest_framework', 2500, 48000),
+        ])
+
+    def test_command(self):
+        stdout = io.StringIO()
+        call_command('import_times', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('Запуск:', output)
+        self.assertIn('Модули проекта', output)
+        self.assertIn('мс  django\n', output)
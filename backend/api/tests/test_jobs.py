@@ -0,0 +1,81 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils.functional import empty
+from foodgram.storage import private_storage
+from jobs.models import Job
+from jobs.registry import claim_job, run_job
+from recipes.models import Ingredient, ShoppingCart
+from recipes.tests.factories import create_recipe, create_user, image_data
+from rest_framework.test import APIClient
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT,
+                   PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT)
+class AsyncJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        flour = Ingredient.objects.create(name='Мука', measurement_unit='г')
+        ShoppingCart.objects.create(
+            user=cls.user,
+            recipe=create_recipe(
+                create_user('author'), ingredients=[(flour, 500)]))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(PRIVATE_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        private_storage._wrapped = empty
+        self.addCleanup(setattr, private_storage, '_wrapped', empty)
+        self.client = APIClient(HTTP_PREFER='respond-async')
+        self.client.force_authenticate(self.user)
+
+    def run_jobs(self):
+        while (job := claim_job('worker')) is not None:
+            run_job(job)
+
+    def test_avatar_upload_is_staged_outside_the_job(self):
+        response = self.client.put(
+            '/api/users/me/avatar/', {'avatar': image_data()}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual(set(job.payload), {'user_id', 'path'})
+        self.assertTrue(private_storage.exists(job.payload['path']))
+        self.run_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.avatar.name.startswith('users/images/'))
+        self.assertFalse(private_storage.exists(job.payload['path']))
+
+    def test_pdf_export_can_run_async(self):
+        response = self.client.get(
+            '/api/recipes/download_shopping_cart/?type=pdf')
+        self.assertEqual(response.status_code, 202)
+        url = f'/api/jobs/{response.data["id"]}/download/'
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.run_jobs()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(
+            b'%PDF'))
+        other = APIClient()
+        other.force_authenticate(create_user('other'))
+        self.assertEqual(other.get(url).status_code, 404)
+
+    def test_txt_export_result_has_content(self):
+        response = self.client.get('/api/recipes/download_shopping_cart/')
+        self.run_jobs()
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertIn('Мука', job.result['content'])
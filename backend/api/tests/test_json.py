@@ -0,0 +1,62 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from unittest import mock
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = {
+    'name': 'Борщ   </script>',
+    'amount': Decimal('1.50'),
+    'created': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    'day': date(2024, 1, 2),
+    'at': time(12, 30, 0, 1500),
+    'uuid': uuid.UUID(int=1),
+    'tags': [1, 2.5, None, True],
+    1: 'ключ-число',
+}
+
+
+class ORJSONTests(SimpleTestCase):
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(
+            io.BytesIO(body), parser_context={'encoding': encoding})
+
+    def test_renderer_matches_json_renderer(self):
+        self.assertEqual(
+            ORJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_renderer_falls_back_for_indent(self):
+        context = {'indent': 2}
+        self.assertEqual(
+            ORJSONRenderer().render(DATA, renderer_context=context),
+            JSONRenderer().render(DATA, renderer_context=context))
+
+    def test_renderer_without_orjson(self):
+        with mock.patch('api.renderers.orjson', None):
+            self.assertEqual(
+                ORJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+
+    def test_parser_matches_json_parser(self):
+        body = JSONRenderer().render({'name': 'Щи', 'amount': [1, 2.5]})
+        self.assertEqual(
+            self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_parser_falls_back_for_other_encodings(self):
+        body = '{"name": "Щи"}'.encode('cp1251')
+        self.assertEqual(
+            self.parse(ORJSONParser(), body, 'cp1251'), {'name': 'Щи'})
+        with mock.patch('api.parsers.orjson', None):
+            self.assertEqual(
+                self.parse(ORJSONParser(), b'{"a": 1}'), {'a': 1})
+
+    def test_parser_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(ORJSONParser(), b'{"a":')
@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from recipes.models import Ingredient, MealPlanEntry, ShoppingCart
+from recipes.services import get_shopping_list_entries, get_shopping_list_items
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+class MealPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.other = create_user('other')
+        flour = Ingredient.objects.create(name='Мука', measurement_unit='г')
+        cls.bread = create_recipe(
+            create_user('author'), name='Хлеб', ingredients=[(flour, 400)])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_amounts(self, start=None, end=None):
+        return [
+            (item['amount'], item['measurement_unit'])
+            for item in get_shopping_list_items(
+                get_shopping_list_entries(self.user, start, end))
+        ]
+
+    def test_cart_multiplier(self):
+        url = f'/api/recipes/{self.bread.id}/shopping_cart/'
+        response = self.client.post(url, {'multiplier': '2.5'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get_amounts(), [(1, 'кг')])
+        response = self.client.patch(url, {'multiplier': '0.5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['multiplier'], '0.50')
+        self.assertEqual(self.get_amounts(), [(200, 'г')])
+        response = self.client.patch(url, {'multiplier': '0'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            ShoppingCart.objects.get(user=self.user).multiplier,
+            Decimal('0.5'))
+
+    def test_plan_is_private_and_filtered_by_period(self):
+        for day, multiplier in ((date(2024, 1, 1), '1'),
+                                (date(2024, 1, 2), '2'),
+                                (date(2024, 1, 8), '3')):
+            response = self.client.post('/api/meal_plan/', {
+                'recipe': self.bread.id, 'day': day,
+                'multiplier': multiplier})
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['recipe']['name'], 'Хлеб')
+        MealPlanEntry.objects.create(
+            user=self.other, recipe=self.bread, day=date(2024, 1, 1))
+        response = self.client.get(
+            '/api/meal_plan/', {'start': '2024-01-01', 'end': '2024-01-07'})
+        self.assertEqual(
+            [entry['day'] for entry in response.data],
+            ['2024-01-01', '2024-01-02'])
+        other_entry = MealPlanEntry.objects.get(user=self.other)
+        response = self.client.delete(f'/api/meal_plan/{other_entry.id}/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            self.get_amounts(date(2024, 1, 1), date(2024, 1, 7)),
+            [(Decimal('1.2'), 'кг')])
+        self.assertEqual(
+            self.get_amounts(start=date(2024, 1, 2)), [(2, 'кг')])
+
+    def test_invalid_period(self):
+        response = self.client.get(
+            '/api/recipes/download_shopping_cart/',
+            {'start': '2024-01-08', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/meal_plan/', {'start': 'завтра'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from recipes.models import Ingredient, Recipe, Tag
+from recipes.nutrition import recompute_nutrition
+from recipes.tests.factories import create_recipe, create_user, image_data
+from rest_framework.test import APIClient
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeNutritionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author')
+        cls.tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+        cls.flour = Ingredient.objects.create(
+            name='Мука', measurement_unit='г',
+            calories=364, proteins=10, fats=1, carbohydrates=76)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_created_recipe_gets_nutrition(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/recipes/', {
+                'name': 'Блины',
+                'text': 'Смешать и пожарить',
+                'cooking_time': 20,
+                'image': image_data(),
+                'tags': [self.tag.id],
+                'ingredients': [{'id': self.flour.id, 'amount': 100}],
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        recipe = Recipe.objects.get(id=response.data['id'])
+        self.assertEqual(recipe.calories, 364)
+        self.assertEqual(recipe.carbohydrates, 76)
+
+    def test_updated_ingredients_recompute_nutrition(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe = create_recipe(
+                self.author, ingredients=[(self.flour, 100)],
+                tags=[self.tag])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/recipes/{recipe.id}/', {
+                'tags': [self.tag.id],
+                'ingredients': [{'id': self.flour.id, 'amount': 300}],
+            }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.calories, 364 * 3)
+
+    @override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300)
+    def test_recompute_invalidates_cached_lists(self):
+        recipe = create_recipe(self.author, ingredients=[(self.flour, 100)])
+        anonymous = APIClient()
+        response = anonymous.get('/api/recipes/')
+        self.assertIsNone(response.data['results'][0]['nutrition'])
+        response = anonymous.get('/api/recipes/?max_calories=500')
+        self.assertEqual(response.data['count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            recompute_nutrition([recipe.id])
+        response = anonymous.get('/api/recipes/')
+        self.assertEqual(
+            response.data['results'][0]['nutrition']['calories'], 364)
+        response = anonymous.get('/api/recipes/?max_calories=500')
+        self.assertEqual(response.data['count'], 1)
@@ -0,0 +1,73 @@
+import io
+import os
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from foodgram.profiling import StackSampler
+from recipes.models import Favorite, Tag
+from recipes.tests.factories import create_recipe, create_user
+
+
+def busy_loop(duration):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pass
+
+
+class StackSamplerTests(SimpleTestCase):
+    def test_samples_the_profiled_thread(self):
+        with StackSampler(interval=0.001) as sampler:
+            busy_loop(0.1)
+        self.assertGreater(sampler.samples, 0)
+        [(frame, count)] = sampler.hottest(1)
+        self.assertIn('busy_loop', frame)
+        output = io.StringIO()
+        sampler.write_collapsed(output)
+        stack, count = output.getvalue().splitlines()[0].rsplit(' ', 1)
+        self.assertTrue(stack.endswith(frame))
+        self.assertGreater(int(count), 0)
+
+
+class ProfileEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.recipe = create_recipe(create_user('author'))
+        Tag.objects.create(name='Обед', slug='lunch')
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, 'profile.folded')
+
+    def profile(self, *args, **options):
+        stdout = io.StringIO()
+        call_command('profile_endpoint', *args, output=self.output,
+                     host='testserver', stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_profile_read_endpoint(self):
+        output = self.profile('get', '/api/tags/', repeat=3, explain=1)
+        self.assertIn('GET /api/tags/ -> 200', output)
+        self.assertIn('запросов на запрос', output)
+        self.assertIn('recipes_tag', output)
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_writes_are_rolled_back(self):
+        output = self.profile(
+            'post', f'/api/recipes/{self.recipe.id}/favorite/',
+            user='user', repeat=2, explain=0)
+        self.assertIn('-> 201', output)
+        self.assertFalse(Favorite.objects.exists())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            self.profile('get', '/api/tags/', repeat=0)
+        with self.assertRaises(CommandError):
+            self.profile('post', '/api/tags/', data='{')
+        with self.assertRaises(CommandError):
+            self.profile('get', '/api/tags/', user='nobody')
@@ -0,0 +1,80 @@
+import io
+
+from api.response_cache import get_warm_urls, warm_response_cache
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from jobs.models import Job
+from recipes.models import Tag
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+@override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300,
+                   CACHE_WARM_HOST='testserver', CACHE_WARM_DELAY=0)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_slugs(self):
+        return [tag['slug'] for tag in self.client.get('/api/tags/').data]
+
+    def test_changes_invalidate_cached_list(self):
+        Tag.objects.create(name='Завтрак', slug='breakfast')
+        self.assertEqual(self.get_slugs(), ['breakfast'])
+        Tag.objects.filter(slug='breakfast').update(name='Обед')
+        self.assertEqual(self.get_slugs(), ['breakfast'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='Ужин', slug='dinner')
+        self.assertEqual(self.get_slugs(), ['breakfast', 'dinner'])
+        self.assertTrue(
+            Job.objects.filter(name='cache.warm', status=Job.PENDING).exists())
+
+    def test_warm_cache_command(self):
+        stdout = io.StringIO()
+        call_command('warm_cache', pages=1, stdout=stdout)
+        self.assertIn('200 /api/tags/', stdout.getvalue())
+
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def test_disallowed_host(self):
+        with self.assertRaises(ImproperlyConfigured):
+            warm_response_cache(pages=1, host='example.org')
+        with self.assertRaises(CommandError):
+            call_command('warm_cache', host='example.org')
+
+    @override_settings(SHARED_CACHE=False)
+    def test_warm_skipped_without_shared_cache(self):
+        stderr = io.StringIO()
+        call_command('warm_cache', stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('прогрев пропущен', stderr.getvalue())
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='Ужин', slug='dinner')
+        self.assertFalse(Job.objects.filter(name='cache.warm').exists())
+
+    @override_settings(CACHE_WARM_TAG_FILTERS=3)
+    def test_warm_urls_follow_popular_tag_filters(self):
+        author = create_user('author')
+        breakfast, dinner, dessert = (
+            Tag.objects.create(name=slug, slug=slug)
+            for slug in ('breakfast', 'dinner', 'dessert')
+        )
+        create_recipe(author, tags=[dinner, dessert])
+        create_recipe(author, tags=[dinner, dessert])
+        create_recipe(author, tags=[dinner])
+        create_recipe(author, tags=[breakfast])
+        create_recipe(author, tags=[breakfast], deleted_at=timezone.now())
+        recipe_urls = [
+            url for url in get_warm_urls(pages=1, limit=6)
+            if url.startswith('/api/recipes/')
+        ]
+        self.assertEqual(recipe_urls, [
+            '/api/recipes/?page=1&limit=6',
+            '/api/recipes/?page=1&limit=6'
+            '&tags=breakfast&tags=dessert&tags=dinner',
+            '/api/recipes/?page=1&limit=6&tags=dinner',
+            '/api/recipes/?page=1&limit=6&tags=dessert',
+            '/api/recipes/?page=1&limit=6&tags=dessert&tags=dinner',
+        ])
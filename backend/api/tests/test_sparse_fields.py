@@ -0,0 +1,43 @@
+import io
+
+from api.serializers import get_requested_fields
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from recipes.models import Ingredient
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+class SparseFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ingredient = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+        cls.recipe = create_recipe(
+            create_user('author'), ingredients=[(cls.ingredient, 100)])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_fields_and_omit(self):
+        response = self.client.get('/api/recipes/?fields=id,name,text')
+        self.assertEqual(
+            set(response.data['results'][0]), {'id', 'name', 'text'})
+        response = self.client.get(
+            f'/api/recipes/{self.recipe.id}/?omit=text,ingredients')
+        self.assertNotIn('text', response.data)
+        self.assertNotIn('ingredients', response.data)
+        self.assertIn('author', response.data)
+
+    def test_plain_django_request(self):
+        request = RequestFactory().get('/', {'omit': 'text'})
+        self.assertEqual(
+            get_requested_fields(request, ['id', 'name', 'text']),
+            {'id', 'name'})
+
+    def test_benchmark_json_command(self):
+        stdout = io.StringIO()
+        call_command('benchmark_json', repeat=1, stdout=stdout)
+        self.assertIn('recipes', stdout.getvalue())
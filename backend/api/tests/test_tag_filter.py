@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from recipes.models import Tag
+from recipes.services import get_tag_catalog
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+@override_settings(TAG_CATALOG_CACHE_TIMEOUT=300)
+class TagFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author')
+        other = create_user('other')
+        cls.lunch = Tag.objects.create(name='Обед', slug='lunch')
+        cls.dinner = Tag.objects.create(name='Ужин', slug='dinner')
+        create_recipe(cls.author, tags=[cls.lunch, cls.dinner])
+        create_recipe(cls.author, tags=[cls.lunch])
+        create_recipe(other, tags=[cls.dinner])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_filter_by_tags(self):
+        response = self.client.get('/api/recipes/?tags=lunch')
+        self.assertEqual(response.data['count'], 2)
+        response = self.client.get('/api/recipes/?tags=lunch&tags=dinner')
+        self.assertEqual(response.data['count'], 3)
+
+    def test_unknown_tag_is_rejected(self):
+        response = self.client.get('/api/recipes/?tags=brunch')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tags', response.data)
+
+    def test_catalog_is_cached_until_tags_change(self):
+        get_tag_catalog()
+        with self.assertNumQueries(0):
+            get_tag_catalog()
+        Tag.objects.create(name='Завтрак', slug='breakfast')
+        response = self.client.get('/api/recipes/?tags=breakfast')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_tag_facets_ignore_the_tag_filter(self):
+        response = self.client.get(
+            f'/api/recipes/?facets=tags&tags=lunch&author={self.author.id}')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            response.data['facets'], {'tags': {'lunch': 2, 'dinner': 1}})
+        response = self.client.get('/api/recipes/')
+        self.assertNotIn('facets', response.data)
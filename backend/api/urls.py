@@ -1,14 +1,16 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import (IngredientViewSet, RecipeViewSet, TagViewSet,
-                    UserProfileViewSet)
+from .views import (IngredientViewSet, JobViewSet, MealPlanViewSet,
+                    RecipeViewSet, TagViewSet, UserProfileViewSet)
 
 router = routers.DefaultRouter()
 router.register(r'users', UserProfileViewSet)
 router.register(r'tags', TagViewSet)
 router.register(r'ingredients', IngredientViewSet)
 router.register(r'recipes', RecipeViewSet)
+router.register(r'meal_plan', MealPlanViewSet, basename='meal_plan')
+router.register(r'jobs', JobViewSet, basename='jobs')
 app_name = 'api'
 
 
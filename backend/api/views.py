@@ -1,34 +1,82 @@
-import base64
-import os
+import mimetypes
 
 from api.filters import RecipeFilter
 from api.paginations import PageLimitPagination
 from api.permissions import IsAuthorOrReadOnlyPermission
-from api.serializers import (AvatarSerializer, IngredientSerializer,
+from api.response_cache import CachedListMixin
+from api.serializers import (AvatarSerializer, DateRangeSerializer,
+                             IngredientSerializer, JobSerializer,
+                             MealPlanEntrySerializer, MultiplierSerializer,
                              RecipeSerializer, RecipeShortSerializer,
-                             SubscribedUserSerializer, TagSerializer)
+                             ShoppingCartSummarySerializer,
+                             SubscribedUserSerializer, TagSerializer,
+                             get_requested_fields, parse_field_names)
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
-from django.http import FileResponse, Http404
+from django.db import transaction
+from django.db.models import Count
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
+from djoser.utils import logout_user
 from djoser.views import UserViewSet
-from recipes.models import (Favorite, Ingredient, Recipe, ShoppingCart,
-                            Subscribe, Tag)
-from recipes.services import generate_shopping_list
+from foodgram.storage import private_storage
+from jobs.models import Job
+from jobs.registry import enqueue
+from recipes.deletion import tombstone_recipe, tombstone_user
+from recipes.feed import get_feed
+from recipes.models import (Favorite, Ingredient, MealPlanEntry, Recipe,
+                            ShoppingCart, Subscribe, Tag)
+from recipes.services import (decode_avatar, export_shopping_list,
+                              get_shopping_cart_summary, get_tag_catalog,
+                              save_avatar, stage_avatar_upload)
+from recipes.shortlinks import encode_short_code, recipe_exists
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 User = get_user_model()
 
+FRAGMENT_FIELDS = {'ingredients', 'tags', 'author', 'text'}
+
+
+def respond_async(request):
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def job_accepted(request, job):
+    location = request.build_absolute_uri(
+        reverse('api:jobs-detail', kwargs={'pk': job.pk}))
+    return Response(
+        JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': location},
+    )
+
+
+def send_private_file(name, filename):
+    if not settings.USE_X_ACCEL_REDIRECT:
+        return FileResponse(private_storage.open(name), as_attachment=True,
+                            filename=filename)
+    response = HttpResponse(content_type=mimetypes.guess_type(filename)[0])
+    response['X-Accel-Redirect'] = private_storage.url(name)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 
 class UserProfileViewSet(UserViewSet):
     pagination_class = PageLimitPagination
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        if instance == self.request.user:
+            logout_user(self.request)
+        tombstone_user(instance)
+
     @action(
         methods=['PUT', 'PATCH'],
         detail=False,
@@ -39,12 +87,17 @@ class UserProfileViewSet(UserViewSet):
         user = request.user
         avatar_base64 = request.data.get('avatar')
         if avatar_base64:
-            avatar_base64 = avatar_base64.split(',')[1]
-            avatar_data = base64.b64decode(avatar_base64)
-            avatar_file = ContentFile(avatar_data,
-                                      name=f'avatar{user.id}.png')
-            user.avatar.save(f'avatar{user.id}.png', avatar_file)
-            user.save()
+            avatar_data = decode_avatar(avatar_base64)
+            if respond_async(request):
+                return job_accepted(request, enqueue(
+                    'users.save_avatar',
+                    {
+                        'user_id': user.id,
+                        'path': stage_avatar_upload(user, avatar_data),
+                    },
+                    user=user,
+                ))
+            save_avatar(user, avatar_data)
             return Response(
                 AvatarSerializer(user, context={'request': request}).data
             )
@@ -55,9 +108,8 @@ class UserProfileViewSet(UserViewSet):
     def del_avatar(self, request):
         user = request.user
         if user.avatar:
-            os.remove(user.avatar.path)
             user.avatar = None
-            user.save()
+            user.save(update_fields=['avatar'])
             return Response(status=204)
         else:
             return Response({"errors": "У вас нет аватара"}, status=400)
@@ -114,18 +166,19 @@ class UserProfileViewSet(UserViewSet):
         return self.get_paginated_response(serializer.data)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
+    throttle_scope = 'ingredients'
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -135,37 +188,111 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     serializer_class = RecipeSerializer
     pagination_class = PageLimitPagination
     permission_classes = (IsAuthorOrReadOnlyPermission, )
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    cache_anonymous_only = True
+    throttle_scope = 'recipes'
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        fields = get_requested_fields(
+            self.request, RecipeSerializer.Meta.fields)
+        deferred = []
+        if 'text' not in fields:
+            deferred.append('text')
+        if not fields & FRAGMENT_FIELDS:
+            deferred.append('fragment')
+        return queryset.defer(*deferred)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        facets = parse_field_names(self.request.query_params.get('facets'))
+        if 'tags' in facets:
+            response.data['facets'] = {'tags': self.get_tag_facets()}
+        return response
+
+    def get_tag_facets(self):
+        query_params = self.request.query_params.copy()
+        query_params.pop('tags', None)
+        recipes = self.filterset_class(
+            query_params, queryset=Recipe.objects.all(), request=self.request
+        ).qs
+        counts = dict(
+            Recipe.tags.through.objects
+            .filter(recipe__in=recipes.values('id'))
+            .values_list('tag__slug')
+            .annotate(count=Count('recipe', distinct=True))
+            .order_by()
+        )
+        return {
+            tag['slug']: counts.get(tag['slug'], 0)
+            for tag in get_tag_catalog()
+        }
+
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        tombstone_recipe(instance)
+
+    @action(detail=False, permission_classes=(IsAuthenticated, ))
+    def feed(self, request):
+        params = {}
+        for name in ('before', 'limit'):
+            value = request.query_params.get(name)
+            if value is not None and not value.isdigit():
+                raise ValidationError({name: 'Ожидается целое число'})
+            params[name] = int(value) if value else None
+        limit = min(
+            params['limit'] or settings.FEED_PAGE_SIZE,
+            settings.FEED_MAX_PAGE_SIZE
+        )
+        recipes = get_feed(request.user, params['before'], limit)
+        next_url = None
+        if len(recipes) == limit:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'before', recipes[-1].id)
+        return Response({
+            'next': next_url,
+            'results': self.get_serializer(recipes, many=True).data,
+        })
+
     @action(detail=True,
             permission_classes=[permissions.AllowAny],
             url_path='get-link')
     def get_link(self, request, pk=None):
-        exists = Recipe.objects.filter(id=pk).exists()
-        if not exists:
+        if not pk.isdigit() or not recipe_exists(int(pk)):
             raise Http404(f'Рецепт с id={pk} не найден')
         short_path = reverse(
-            'recipes:recipe-short-link', kwargs={'recipe_id': pk})
+            'recipes:recipe-short-link',
+            kwargs={'code': encode_short_code(pk)}
+        )
         absolute_url = request.build_absolute_uri(short_path)
 
         return Response({'short-link': absolute_url})
 
-    def add_to_favorite_or_shopping_cart(self, request, model, pk=None):
+    def add_to_favorite_or_shopping_cart(self, request, model, pk=None,
+                                         **defaults):
         recipe = get_object_or_404(Recipe, id=pk)
         collection_name = model._meta.verbose_name.lower()
 
         _, created = model.objects.get_or_create(
             recipe=recipe,
-            user=request.user
+            user=request.user,
+            defaults=defaults,
         )
 
         if not created:
@@ -190,7 +317,25 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated, )
     )
     def shopping_cart(self, request, pk=None):
-        return self.add_to_favorite_or_shopping_cart(request, ShoppingCart, pk)
+        serializer = MultiplierSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.add_to_favorite_or_shopping_cart(
+            request, ShoppingCart, pk, **serializer.validated_data)
+
+    @shopping_cart.mapping.patch
+    @transaction.atomic
+    def update_shopping_cart(self, request, pk=None):
+        serializer = MultiplierSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entry = get_object_or_404(
+            ShoppingCart.objects.select_related('recipe'),
+            recipe_id=pk, user=request.user)
+        entry.multiplier = serializer.validated_data['multiplier']
+        entry.save(update_fields=['multiplier'])
+        return Response({
+            **RecipeShortSerializer(entry.recipe).data,
+            'multiplier': serializer.data['multiplier'],
+        })
 
     @shopping_cart.mapping.delete
     def delete_shopping_cart(self, request, pk=None):
@@ -200,9 +345,38 @@ class RecipeViewSet(viewsets.ModelViewSet):
             permission_classes=(IsAuthenticated, ),
             url_path='download_shopping_cart')
     def download_shopping_cart(self, request):
-        shopping_list = generate_shopping_list(request.user)
-        return FileResponse(shopping_list, as_attachment=True,
-                            filename='shopping_list.txt')
+        file_type = (
+            'pdf' if request.query_params.get('type') == 'pdf' else 'txt'
+        )
+        period = DateRangeSerializer(data=request.query_params)
+        period.is_valid(raise_exception=True)
+        if respond_async(request):
+            return job_accepted(request, enqueue(
+                'recipes.shopping_list',
+                {
+                    'user_id': request.user.id,
+                    'file_type': file_type,
+                    **period.data,
+                },
+                user=request.user,
+            ))
+        return send_private_file(
+            export_shopping_list(
+                request.user, file_type, **period.validated_data),
+            f'shopping_list.{file_type}',
+        )
+
+    @action(detail=False,
+            permission_classes=(IsAuthenticated, ),
+            url_path='shopping_cart/summary')
+    def shopping_cart_summary(self, request):
+        since = request.query_params.get('since')
+        if since is not None and not since.isdigit():
+            raise ValidationError({'since': 'Ожидается номер версии'})
+        summary = get_shopping_cart_summary(
+            request.user, int(since) if since is not None else None
+        )
+        return Response(ShoppingCartSummarySerializer(summary).data)
 
     @action(methods=['POST'], detail=True,
             permission_classes=(IsAuthenticated, ))
@@ -212,3 +386,42 @@ class RecipeViewSet(viewsets.ModelViewSet):
     @favorite.mapping.delete
     def del_favorite(self, request, pk=None):
         return self.remove_recipe(request, Favorite, pk)
+
+
+class MealPlanViewSet(viewsets.ModelViewSet):
+    serializer_class = MealPlanEntrySerializer
+    pagination_class = None
+    permission_classes = (IsAuthenticated, )
+
+    def get_queryset(self):
+        period = DateRangeSerializer(data=self.request.query_params)
+        period.is_valid(raise_exception=True)
+        queryset = MealPlanEntry.objects.filter(
+            user=self.request.user, recipe__deleted_at__isnull=True
+        ).select_related('recipe')
+        if 'start' in period.validated_data:
+            queryset = queryset.filter(
+                day__gte=period.validated_data['start'])
+        if 'end' in period.validated_data:
+            queryset = queryset.filter(day__lte=period.validated_data['end'])
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    pagination_class = PageLimitPagination
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.request.user)
+
+    @action(detail=True)
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != Job.SUCCEEDED or 'file' not in (job.result or {}):
+            raise Http404('Файл задачи не готов')
+        return send_private_file(job.result['file'], job.result['filename'])
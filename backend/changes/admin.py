@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Change, ConsumerOffset
+
+
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'model', 'object_id', 'action', 'created_at')
+    list_filter = ('model', 'action')
+    search_fields = ('object_id',)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ConsumerOffsetAdmin(admin.ModelAdmin):
+    list_display = ('consumer', 'position', 'updated_at')
+
+
+admin.site.register(Change, ChangeAdmin)
+admin.site.register(ConsumerOffset, ConsumerOffsetAdmin)
@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Func, Q
+from django.utils import timezone
+
+from .models import Change, ConsumerOffset
+
+TRACKED_MODELS = (
+    'recipes.Recipe',
+    'recipes.Recipe_tags',
+    'recipes.IngredientAmount',
+    'recipes.Favorite',
+    'recipes.ShoppingCart',
+    'recipes.Subscribe',
+    'recipes.Tag',
+    'recipes.Ingredient',
+)
+
+
+class TransactionId(Func):
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return '0', []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return 'txid_current()', []
+
+
+def get_visibility_horizon():
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        return cursor.fetchone()[0]
+
+
+def is_tracked(model):
+    return model._meta.label in TRACKED_MODELS
+
+
+def relation_fields(model):
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.is_relation
+    ]
+
+
+def record_change(instance, action, fields=None):
+    data = {
+        name: getattr(instance, name)
+        for name in relation_fields(type(instance))
+    }
+    if fields:
+        data['fields'] = sorted(fields)
+    return Change.objects.create(
+        model=instance._meta.label_lower,
+        object_id=instance.pk,
+        action=action,
+        data=data,
+        transaction_id=TransactionId(),
+    )
+
+
+def record_queryset(queryset, action, fields=None):
+    model = queryset.model
+    if not is_tracked(model):
+        return 0
+    names = relation_fields(model)
+    extra = {'fields': sorted(fields)} if fields else {}
+    changes = [
+        Change(
+            model=model._meta.label_lower,
+            object_id=row[0],
+            action=action,
+            data={**dict(zip(names, row[1:])), **extra},
+            transaction_id=TransactionId(),
+        )
+        for row in queryset.values_list('pk', *names).iterator()
+    ]
+    Change.objects.bulk_create(changes, batch_size=1000)
+    return len(changes)
+
+
+def after_position(transaction_id, position):
+    return (
+        Q(transaction_id__gt=transaction_id)
+        | Q(transaction_id=transaction_id, id__gt=position)
+    )
+
+
+def read_changes(after=(0, 0), limit=None):
+    changes = Change.objects.filter(after_position(*after))
+    horizon = get_visibility_horizon()
+    if horizon is not None:
+        changes = changes.filter(transaction_id__lt=horizon)
+    return list(
+        changes.order_by('transaction_id', 'id')[
+            :limit or settings.CHANGE_LOG_BATCH_SIZE]
+    )
+
+
+def consume(consumer, handler, limit=None):
+    with transaction.atomic():
+        offset, _ = (
+            ConsumerOffset.objects
+            .select_for_update()
+            .get_or_create(consumer=consumer)
+        )
+        changes = read_changes(
+            (offset.transaction_id, offset.position), limit)
+        if changes:
+            handler(changes)
+            offset.transaction_id = changes[-1].transaction_id
+            offset.position = changes[-1].id
+            offset.save(
+                update_fields=['transaction_id', 'position', 'updated_at'])
+    return len(changes)
+
+
+def consume_all(consumer, handler, limit=None):
+    limit = limit or settings.CHANGE_LOG_BATCH_SIZE
+    consumed = 0
+    while True:
+        count = consume(consumer, handler, limit)
+        consumed += count
+        if count < limit:
+            return consumed
+
+
+def reset_consumer(consumer):
+    ConsumerOffset.objects.update_or_create(
+        consumer=consumer, defaults={'transaction_id': 0, 'position': 0})
+
+
+def get_consumer_lag():
+    return [
+        {
+            'consumer': offset.consumer,
+            'position': offset.position,
+            'lag': Change.objects.filter(after_position(
+                offset.transaction_id, offset.position)).count(),
+            'updated_at': offset.updated_at,
+        }
+        for offset in ConsumerOffset.objects.all()
+    ]
+
+
+def prune_changes(retention=None, batch_size=None):
+    if retention is None:
+        retention = settings.CHANGE_LOG_RETENTION
+    batch_size = batch_size or settings.CHANGE_LOG_BATCH_SIZE
+    changes = Change.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=retention))
+    slowest = ConsumerOffset.objects.order_by(
+        'transaction_id', 'position').first()
+    if slowest is not None:
+        changes = changes.exclude(
+            after_position(slowest.transaction_id, slowest.position))
+    deleted = 0
+    while True:
+        ids = list(changes.order_by('id').values_list('id', flat=True)[
+            :batch_size])
+        if not ids:
+            return deleted
+        deleted += Change.objects.filter(id__in=ids).delete()[0]
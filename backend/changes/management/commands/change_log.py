@@ -0,0 +1,33 @@
+from changes.log import get_consumer_lag, prune_changes, reset_consumer
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Состояние обработчиков журнала изменений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            type=str,
+            metavar='CONSUMER',
+            help='Сбросить позицию обработчика, чтобы он прочитал журнал '
+                 'с начала'
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Удалить изменения, прочитанные всеми обработчиками'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_consumer(options['reset'])
+        if options['prune']:
+            self.stdout.write(f'Удалено изменений: {prune_changes()}')
+        for consumer in get_consumer_lag():
+            self.stdout.write(
+                f'{consumer["consumer"]:<32} '
+                f'позиция {consumer["position"]:>10}  '
+                f'отставание {consumer["lag"]:>8}  '
+                f'обновлено {consumer["updated_at"]:%Y-%m-%d %H:%M:%S}'
+            )
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.3 on 2026-10-19 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='change',
+            options={'ordering': ['transaction_id', 'id'], 'verbose_name': 'Изменение', 'verbose_name_plural': 'Журнал изменений'},
+        ),
+        migrations.AddField(
+            model_name='change',
+            name='transaction_id',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Транзакция'),
+        ),
+        migrations.AddField(
+            model_name='consumeroffset',
+            name='transaction_id',
+            field=models.BigIntegerField(default=0, verbose_name='Транзакция последнего изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['transaction_id', 'id'], name='change_transaction_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Change(models.Model):
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTIONS = (
+        (CREATE, 'Создание'),
+        (UPDATE, 'Изменение'),
+        (DELETE, 'Удаление'),
+    )
+
+    model = models.CharField(max_length=100, verbose_name='Модель')
+    object_id = models.BigIntegerField(verbose_name='Идентификатор объекта')
+    action = models.CharField(
+        max_length=8, choices=ACTIONS, verbose_name='Действие')
+    data = models.JSONField(default=dict, verbose_name='Данные')
+    transaction_id = models.BigIntegerField(
+        default=0, editable=False, verbose_name='Транзакция')
+    created_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Создано')
+
+    class Meta:
+        ordering = ['transaction_id', 'id']
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        indexes = [
+            models.Index(
+                fields=['transaction_id', 'id'],
+                name='change_transaction_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'#{self.id} {self.model}:{self.object_id} ({self.action})'
+
+
+class ConsumerOffset(models.Model):
+    consumer = models.CharField(
+        max_length=128, unique=True, verbose_name='Обработчик')
+    transaction_id = models.BigIntegerField(
+        default=0, verbose_name='Транзакция последнего изменения')
+    position = models.BigIntegerField(
+        default=0, verbose_name='Последнее обработанное изменение')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлено')
+
+    class Meta:
+        ordering = ['consumer']
+        verbose_name = 'Позиция обработчика'
+        verbose_name_plural = 'Позиции обработчиков'
+
+    def __str__(self):
+        return f'{self.consumer} → {self.position}'
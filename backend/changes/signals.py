@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .log import TRACKED_MODELS, record_change, record_queryset
+from .models import Change
+
+M2M_ACTIONS = {
+    'post_add': Change.CREATE,
+    'pre_remove': Change.DELETE,
+    'pre_clear': Change.DELETE,
+}
+
+
+def record_saved(sender, instance, created, update_fields, **kwargs):
+    if created:
+        record_change(instance, Change.CREATE)
+    else:
+        record_change(instance, Change.UPDATE, update_fields)
+
+
+def record_deleted(sender, instance, **kwargs):
+    record_change(instance, Change.DELETE)
+
+
+def record_m2m_changed(sender, instance, action, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    source, target = [
+        field for field in sender._meta.concrete_fields if field.is_relation
+    ]
+    if not isinstance(instance, source.related_model):
+        source, target = target, source
+    rows = sender.objects.filter(**{source.attname: instance.pk})
+    if action != 'pre_clear':
+        rows = rows.filter(**{f'{target.attname}__in': pk_set})
+    record_queryset(rows, M2M_ACTIONS[action])
+
+
+for label in TRACKED_MODELS:
+    model = apps.get_model(label)
+    if model._meta.auto_created:
+        m2m_changed.connect(record_m2m_changed, sender=model)
+    else:
+        post_save.connect(record_saved, sender=model)
+        post_delete.connect(record_deleted, sender=model)
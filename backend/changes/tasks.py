@@ -0,0 +1,8 @@
+from jobs.registry import task
+
+from .log import prune_changes
+
+
+@task('changes.prune')
+def prune_changes_task():
+    return {'deleted': prune_changes()}
@@ -0,0 +1,116 @@
+import threading
+import unittest
+from datetime import timedelta
+
+from changes.log import (consume, consume_all, get_consumer_lag, prune_changes,
+                         record_change, reset_consumer)
+from changes.models import Change, ConsumerOffset
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+from recipes.models import Favorite, Tag
+from recipes.tests.factories import create_recipe, create_user
+
+
+class Collector:
+    def __init__(self):
+        self.changes = []
+
+    def __call__(self, changes):
+        self.changes.extend(
+            (change.model, change.object_id, change.action)
+            for change in changes
+        )
+
+
+class ChangeLogTests(TransactionTestCase):
+    def setUp(self):
+        self.user = create_user('user')
+        self.recipe = create_recipe(create_user('author'))
+        Change.objects.all().delete()
+
+    def test_signals_and_consumer_offsets(self):
+        favorite = Favorite.objects.create(user=self.user, recipe=self.recipe)
+        self.recipe.name = 'Новое название'
+        self.recipe.save(update_fields=['name'])
+        favorite_id = favorite.id
+        favorite.delete()
+        collector = Collector()
+        self.assertEqual(consume_all('test', collector, limit=2), 3)
+        self.assertEqual(collector.changes, [
+            ('recipes.favorite', favorite_id, Change.CREATE),
+            ('recipes.recipe', self.recipe.id, Change.UPDATE),
+            ('recipes.favorite', favorite_id, Change.DELETE),
+        ])
+        update = Change.objects.get(action=Change.UPDATE)
+        self.assertEqual(update.data['fields'], ['name'])
+        self.assertEqual(update.data['author_id'], self.recipe.author_id)
+        self.assertEqual(consume('test', collector), 0)
+        self.assertEqual(get_consumer_lag()[0]['lag'], 0)
+
+    def test_failed_handler_keeps_position(self):
+        Tag.objects.create(name='Обед', slug='lunch')
+
+        def fail(changes):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            consume('test', fail)
+        collector = Collector()
+        self.assertEqual(consume('test', collector), 1)
+        reset_consumer('test')
+        self.assertEqual(consume('test', collector), 1)
+
+    def test_prune_keeps_unread_changes(self):
+        tags = [
+            Tag.objects.create(name=f'Тег {index}', slug=f'tag-{index}')
+            for index in range(3)
+        ]
+        Change.objects.update(created_at=timezone.now() - timedelta(days=1))
+        consume('test', Collector(), limit=2)
+        consume('other', Collector(), limit=1)
+        self.assertEqual(prune_changes(retention=3600), 1)
+        self.assertEqual(prune_changes(retention=3600), 0)
+        self.assertEqual(
+            sorted(Change.objects.values_list('object_id', flat=True)),
+            [tags[1].id, tags[2].id])
+        ConsumerOffset.objects.filter(consumer='other').delete()
+        self.assertEqual(prune_changes(retention=3600), 1)
+
+
+@unittest.skipUnless(
+    connection.vendor == 'postgresql',
+    'Горизонт снимка есть только в PostgreSQL')
+class ChangeLogVisibilityTests(TransactionTestCase):
+    def test_late_commit_is_not_skipped(self):
+        tag = Tag.objects.create(name='Обед', slug='lunch')
+        Change.objects.all().delete()
+        started = threading.Event()
+        written = threading.Event()
+        release = threading.Event()
+
+        def slow_transaction():
+            try:
+                with transaction.atomic():
+                    with connections['default'].cursor() as cursor:
+                        cursor.execute('SELECT txid_current()')
+                    started.set()
+                    written.wait(5)
+                    record_change(tag, Change.UPDATE, ['name'])
+                    release.wait(5)
+            finally:
+                connections['default'].close()
+
+        thread = threading.Thread(target=slow_transaction)
+        thread.start()
+        started.wait(5)
+        record_change(tag, Change.DELETE)
+        written.set()
+        collector = Collector()
+        self.assertEqual(consume('test', collector), 0)
+        release.set()
+        thread.join()
+        self.assertEqual(consume('test', collector), 2)
+        self.assertEqual(
+            [action for _, _, action in collector.changes],
+            [Change.UPDATE, Change.DELETE])
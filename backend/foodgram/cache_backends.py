@@ -0,0 +1,32 @@
+from django.core.cache.backends import locmem, memcached
+
+from .metrics import CACHE_REQUESTS
+
+MISSING = object()
+
+
+class MetricsCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, MISSING, version)
+        if value is MISSING:
+            CACHE_REQUESTS.labels(self.metrics_alias, 'miss').inc()
+            return default
+        CACHE_REQUESTS.labels(self.metrics_alias, 'hit').inc()
+        return value
+
+
+class LocMemCache(MetricsCacheMixin, locmem.LocMemCache):
+    # get_many() из BaseCache вызывает get() и уже учтён в метриках.
+    metrics_alias = 'locmem'
+
+
+class PyMemcacheCache(MetricsCacheMixin, memcached.PyMemcacheCache):
+    metrics_alias = 'memcached'
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        CACHE_REQUESTS.labels(self.metrics_alias, 'hit').inc(len(values))
+        CACHE_REQUESTS.labels(self.metrics_alias, 'miss').inc(
+            len(keys) - len(values))
+        return values
@@ -0,0 +1,70 @@
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml',
+    'text/',
+)
+
+
+def get_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header):
+    weights = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+    return weights
+
+
+def negotiate_encoding(header):
+    weights = parse_accept_encoding(header)
+    default = weights.get('*', 0.0)
+    candidates = [
+        (weights.get(encoding, default), -index, encoding)
+        for index, encoding in enumerate(get_encodings())
+    ]
+    weight, _, encoding = max(candidates)
+    return encoding if weight > 0 else None
+
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(content, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def get_compressed(content, encoding, cached=False):
+    if not cached:
+        level = settings.COMPRESSION_LEVELS[encoding]
+        return compress(content, encoding, level)
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    key = f'compressed:{encoding}:{digest}'
+    compressed = cache.get(key)
+    if compressed is None:
+        level = settings.COMPRESSION_CACHED_LEVELS[encoding]
+        compressed = compress(content, encoding, level)
+        cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+    return compressed
@@ -0,0 +1,67 @@
+import os
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+REQUESTS = Counter(
+    'foodgram_http_requests_total',
+    'HTTP requests by view and status',
+    ['view', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'foodgram_http_request_duration_seconds',
+    'HTTP request latency by view',
+    ['view', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Counter(
+    'foodgram_db_queries_total',
+    'Database queries by view and database alias',
+    ['view', 'alias'],
+)
+DB_QUERY_TIME = Counter(
+    'foodgram_db_query_seconds_total',
+    'Time spent in database queries by view and database alias',
+    ['view', 'alias'],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'foodgram_db_queries_per_request',
+    'Database queries per request by view',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_CONNECTIONS_OPENED = Counter(
+    'foodgram_db_connections_opened_total',
+    'Database connections opened by alias',
+    ['alias'],
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    'foodgram_db_connections_open',
+    'Open database connections by alias',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+CACHE_REQUESTS = Counter(
+    'foodgram_cache_requests_total',
+    'Cache lookups by cache alias and result',
+    ['cache', 'result'],
+)
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
+
+
+def metrics_view(request):
+    registry = REGISTRY
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,126 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+
+from .compression import get_compressed, is_compressible, negotiate_encoding
+from .db_router import primary_pinned
+from .metrics import (DB_CONNECTIONS_OPEN, DB_QUERIES, DB_QUERIES_PER_REQUEST,
+                      DB_QUERY_TIME, REQUEST_LATENCY, REQUESTS)
+
+PRIMARY_PIN_COOKIE = 'use_primary_db'
+
+
+class PrimaryPinningMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        is_write = request.method not in SAFE_METHODS
+        token = primary_pinned.set(
+            is_write or PRIMARY_PIN_COOKIE in request.COOKIES
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            primary_pinned.reset(token)
+        if (
+            is_write
+            and settings.DATABASE_REPLICAS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class QueryTimer:
+    def __init__(self, alias):
+        self.alias = alias
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timers = [QueryTimer(connection.alias)
+                  for connection in connections.all()]
+        start = time.perf_counter()
+        status = 500
+        try:
+            with ExitStack() as stack:
+                for timer in timers:
+                    stack.enter_context(
+                        connections[timer.alias].execute_wrapper(timer))
+                response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.observe(request, status, time.perf_counter() - start, timers)
+
+    def observe(self, request, status, duration, timers):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        REQUESTS.labels(view, request.method, status).inc()
+        REQUEST_LATENCY.labels(view, request.method).observe(duration)
+        DB_QUERIES_PER_REQUEST.labels(view).observe(
+            sum(timer.count for timer in timers))
+        for timer in timers:
+            if timer.count:
+                DB_QUERIES.labels(view, timer.alias).inc(timer.count)
+                DB_QUERY_TIME.labels(view, timer.alias).inc(timer.duration)
+            DB_CONNECTIONS_OPEN.labels(timer.alias).set(
+                connections[timer.alias].connection is not None)
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not is_compressible(response.get('Content-Type', ''))
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        encoding = negotiate_encoding(
+            request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+        compressed = get_compressed(
+            response.content, encoding,
+            getattr(response, 'cache_compressed', False)
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
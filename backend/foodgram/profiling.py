@@ -0,0 +1,60 @@
+import sys
+import threading
+from collections import Counter
+
+
+def format_frame(frame):
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', code.co_filename)
+    return f'{module}.{code.co_name}:{code.co_firstlineno}'
+
+
+def format_stack(frame, stop=None):
+    names = []
+    while frame is not None and frame is not stop:
+        names.append(format_frame(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = format_stack(frame, self._root)
+            if stack:
+                self.stacks[stack] += 1
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def hottest(self, limit):
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def write_collapsed(self, file):
+        for stack, count in self.stacks.most_common():
+            file.write(f'{stack} {count}\n')
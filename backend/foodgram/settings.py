@@ -29,10 +29,14 @@ INSTALLED_APPS = [
     'django_filters',
     'recipes.apps.RecipesConfig',
     'api.apps.ApiConfig',
+    'jobs.apps.JobsConfig',
+    'changes.apps.ChangesConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'foodgram.middleware.CompressionMiddleware',
+    'foodgram.middleware.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -41,6 +45,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'foodgram.middleware.MetricsMiddleware')
+
 ROOT_URLCONF = 'foodgram.urls'
 
 TEMPLATES = [
@@ -73,6 +81,126 @@ DATABASES = {
     }
 }
 
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))
+):
+    replica_host, _, replica_port = replica.strip().partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['foodgram.db_router.PrimaryReplicaRouter']
+
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', '')
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'foodgram.cache_backends.PyMemcacheCache' if CACHE_LOCATION
+            else 'foodgram.cache_backends.LocMemCache'
+        ),
+        'LOCATION': CACHE_LOCATION,
+    }
+}
+SHARED_CACHE = not CACHES['default']['BACKEND'].endswith(
+    ('LocMemCache', 'DummyCache')
+)
+
+SHORT_LINK_CACHE_TIMEOUT = int(
+    os.getenv('SHORT_LINK_CACHE_TIMEOUT', 86400 if SHARED_CACHE else 0)
+)
+SHORT_LINK_NEGATIVE_CACHE_TIMEOUT = int(
+    os.getenv('SHORT_LINK_NEGATIVE_CACHE_TIMEOUT', 60 if SHARED_CACHE else 0)
+)
+SHORT_LINK_LRU_SIZE = int(os.getenv('SHORT_LINK_LRU_SIZE', 10000))
+SHORT_LINK_LRU_TIMEOUT = int(os.getenv('SHORT_LINK_LRU_TIMEOUT', 60))
+SHORT_LINK_MAP_PATH = os.getenv('SHORT_LINK_MAP_PATH', '')
+SHORT_LINK_EXPORT_DELAY = int(os.getenv('SHORT_LINK_EXPORT_DELAY', 30))
+
+USER_RELATIONS_CACHE_TIMEOUT = int(
+    os.getenv('USER_RELATIONS_CACHE_TIMEOUT', 300 if SHARED_CACHE else 0)
+)
+
+TAG_CATALOG_CACHE_TIMEOUT = int(
+    os.getenv('TAG_CATALOG_CACHE_TIMEOUT', 86400 if SHARED_CACHE else 0)
+)
+
+CART_SUMMARY_CACHE_TIMEOUT = int(os.getenv('CART_SUMMARY_CACHE_TIMEOUT', 86400))
+
+RESPONSE_CACHE_TIMEOUT = int(
+    os.getenv('RESPONSE_CACHE_TIMEOUT', 300 if SHARED_CACHE else 0)
+)
+CACHE_WARM_PAGES = int(os.getenv('CACHE_WARM_PAGES', 3))
+CACHE_WARM_TAG_FILTERS = int(os.getenv('CACHE_WARM_TAG_FILTERS', 10))
+CACHE_WARM_DELAY = float(os.getenv('CACHE_WARM_DELAY', 0.1))
+CACHE_WARM_JOB_DELAY = int(os.getenv('CACHE_WARM_JOB_DELAY', 30))
+CACHE_WARM_HOST = os.getenv('CACHE_WARM_HOST') or next(
+    (host.lstrip('.') for host in ALLOWED_HOSTS if host != '*'), 'localhost'
+)
+
+SINGLE_FLIGHT_BACKEND = os.getenv('SINGLE_FLIGHT_BACKEND', 'cache')
+SINGLE_FLIGHT_TIMEOUT = int(os.getenv('SINGLE_FLIGHT_TIMEOUT', 5))
+
+FEED_FANOUT_LIMIT = int(os.getenv('FEED_FANOUT_LIMIT', 1000))
+FEED_BACKFILL_SIZE = int(os.getenv('FEED_BACKFILL_SIZE', 50))
+FEED_PAGE_SIZE = int(os.getenv('FEED_PAGE_SIZE', 6))
+FEED_MAX_PAGE_SIZE = int(os.getenv('FEED_MAX_PAGE_SIZE', 100))
+
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+JOBS_VISIBILITY_TIMEOUT = int(os.getenv('JOBS_VISIBILITY_TIMEOUT', 300))
+JOBS_RETRY_DELAY = int(os.getenv('JOBS_RETRY_DELAY', 10))
+JOBS_RETENTION = int(os.getenv('JOBS_RETENTION', 7 * 24 * 3600))
+JOBS_PRUNE_INTERVAL = int(os.getenv('JOBS_PRUNE_INTERVAL', 3600))
+JOBS_SCHEDULE_INTERVAL = int(os.getenv('JOBS_SCHEDULE_INTERVAL', 60))
+
+SHOPPING_LIST_PDF_FONT = os.getenv(
+    'SHOPPING_LIST_PDF_FONT',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+)
+SHOPPING_LIST_PDF_BOLD_FONT = os.getenv(
+    'SHOPPING_LIST_PDF_BOLD_FONT',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+)
+SHOPPING_LIST_EXPORT_MAX_AGE = int(
+    os.getenv('SHOPPING_LIST_EXPORT_MAX_AGE', 86400)
+)
+
+USE_X_ACCEL_REDIRECT = os.getenv('USE_X_ACCEL_REDIRECT', 'False') == 'True'
+
+MEDIA_CLEANUP_GRACE_PERIOD = int(os.getenv('MEDIA_CLEANUP_GRACE_PERIOD', 3600))
+MEDIA_CLEANUP_INTERVAL = int(os.getenv('MEDIA_CLEANUP_INTERVAL', 86400))
+
+PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', 500))
+PURGE_BATCH_DELAY = float(os.getenv('PURGE_BATCH_DELAY', 0.05))
+PURGE_JOB_DELAY = int(os.getenv('PURGE_JOB_DELAY', 60))
+
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_LEVELS = {
+    'br': int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4)),
+    'gzip': int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)),
+}
+COMPRESSION_CACHED_LEVELS = {
+    'br': int(os.getenv('COMPRESSION_CACHED_BROTLI_QUALITY', 9)),
+    'gzip': int(os.getenv('COMPRESSION_CACHED_GZIP_LEVEL', 9)),
+}
+COMPRESSION_CACHE_TIMEOUT = int(os.getenv('COMPRESSION_CACHE_TIMEOUT', 3600))
+
+CHANGE_LOG_BATCH_SIZE = int(os.getenv('CHANGE_LOG_BATCH_SIZE', 500))
+CHANGE_LOG_RETENTION = int(os.getenv('CHANGE_LOG_RETENTION', 7 * 24 * 3600))
+CHANGE_LOG_PRUNE_INTERVAL = int(os.getenv('CHANGE_LOG_PRUNE_INTERVAL', 3600))
+
+JOBS_PERIODIC = {
+    'changes.prune': CHANGE_LOG_PRUNE_INTERVAL,
+    'media.cleanup': MEDIA_CLEANUP_INTERVAL,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,21 +236,65 @@ STATIC_ROOT = BASE_DIR / 'collected_static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+DEFAULT_FILE_STORAGE = 'foodgram.storage.HashedFileSystemStorage'
+
+PRIVATE_MEDIA_URL = '/protected/'
+PRIVATE_MEDIA_ROOT = os.getenv(
+    'PRIVATE_MEDIA_ROOT', os.path.join(BASE_DIR, 'private')
+)
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+API_FAST_JSON = os.getenv('API_FAST_JSON', 'True') == 'True'
+
+API_BASIC_AUTH = os.getenv('API_BASIC_AUTH', 'False') == 'True'
+
+TOKEN_CACHE_TIMEOUT = int(
+    os.getenv('TOKEN_CACHE_TIMEOUT', 300 if SHARED_CACHE else 0)
+)
+TOKEN_CACHE_LRU_SIZE = int(os.getenv('TOKEN_CACHE_LRU_SIZE', 10000))
+TOKEN_CACHE_LRU_TIMEOUT = int(os.getenv('TOKEN_CACHE_LRU_TIMEOUT', 10))
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'api.authentication.CachedTokenAuthentication',
+        *(
+            ['rest_framework.authentication.BasicAuthentication']
+            if API_BASIC_AUTH else []
+        ),
         'rest_framework.authentication.SessionAuthentication',
     ],
 
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer' if API_FAST_JSON
+        else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser' if API_FAST_JSON
+        else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
+    'DEFAULT_THROTTLE_CLASSES': [
+        'foodgram.throttles.AnonScopedRateThrottle',
+    ],
+
+    'DEFAULT_THROTTLE_RATES': {
+        'recipes': os.getenv('THROTTLE_RECIPES_RATE', '120/min'),
+        'ingredients': os.getenv('THROTTLE_INGREDIENTS_RATE', '300/min'),
+        'short_links': os.getenv('THROTTLE_SHORT_LINKS_RATE', '60/min'),
+    },
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 1)),
+
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 6,
 }
@@ -0,0 +1,78 @@
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = MISSING
+
+
+class LocalSingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, timeout):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait(timeout)
+            if call.result is not MISSING:
+                return call.result
+            return func()
+        try:
+            call.result = func()
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class CacheSingleFlight:
+    poll_interval = 0.05
+
+    def do(self, key, func, timeout):
+        lock_key = f'single-flight:lock:{key}'
+        result_key = f'single-flight:result:{key}'
+        if cache.add(lock_key, 1, timeout):
+            try:
+                result = func()
+                cache.set(result_key, result, timeout)
+                return result
+            finally:
+                cache.delete(lock_key)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            result = cache.get(result_key, MISSING)
+            if result is not MISSING:
+                return result
+            if cache.get(lock_key) is None:
+                break
+        return func()
+
+
+BACKENDS = {
+    'local': LocalSingleFlight,
+    'cache': CacheSingleFlight,
+}
+
+
+@lru_cache(maxsize=None)
+def get_single_flight():
+    return BACKENDS[settings.SINGLE_FLIGHT_BACKEND]()
+
+
+def single_flight(key, func):
+    return get_single_flight().do(key, func, settings.SINGLE_FLIGHT_TIMEOUT)
@@ -0,0 +1,100 @@
+import gzip
+import hashlib
+import json
+import os
+from unittest import mock
+
+import brotli
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase
+from django.test.client import RequestFactory
+from foodgram.compression import negotiate_encoding
+from foodgram.middleware import CompressionMiddleware
+from recipes.models import Ingredient
+
+BODY = json.dumps([{'name': 'Мука', 'measurement_unit': 'г'}] * 100).encode()
+
+
+class NegotiationTests(SimpleTestCase):
+    def test_negotiate_encoding(self):
+        cases = {
+            '': None,
+            'identity': None,
+            'gzip': 'gzip',
+            'gzip, deflate, br': 'br',
+            'br;q=0.5, gzip': 'gzip',
+            'br;q=0, gzip;q=0': None,
+            'gzip;q=abc, br': 'br',
+            '*': 'br',
+            '*, br;q=0': 'gzip',
+            'GZIP': 'gzip',
+        }
+        for header, encoding in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_encoding(header), encoding)
+
+    def test_gzip_only_without_brotli(self):
+        with mock.patch('foodgram.compression.brotli', None):
+            self.assertEqual(negotiate_encoding('br, gzip'), 'gzip')
+            self.assertIsNone(negotiate_encoding('br'))
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept_encoding='gzip'):
+        request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, content=BODY, **headers):
+        response = HttpResponse(content, content_type='application/json')
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def test_compresses_and_weakens_etag(self):
+        response = self.process(self.json_response(ETag='"abc"'), 'br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), BODY)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_skip_rules(self):
+        small = self.process(self.json_response(b'{}'))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertEqual(small['Vary'], 'Accept-Encoding')
+        image = self.process(HttpResponse(BODY, content_type='image/png'))
+        self.assertFalse(image.has_header('Content-Encoding'))
+        self.assertFalse(image.has_header('Vary'))
+        encoded = self.process(self.json_response(**{
+            'Content-Encoding': 'identity'}))
+        self.assertEqual(encoded.content, BODY)
+        streaming = self.process(StreamingHttpResponse(
+            [BODY], content_type='application/json'))
+        self.assertFalse(streaming.has_header('Content-Encoding'))
+        plain = self.process(self.json_response(), 'identity')
+        self.assertEqual(plain.content, BODY)
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+        random = self.process(self.json_response(os.urandom(2048)))
+        self.assertFalse(random.has_header('Content-Encoding'))
+
+
+class CachedCompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_list_reuses_compressed_payload(self):
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Мука {index}', measurement_unit='г')
+            for index in range(50)
+        )
+        response = self.client.get(
+            '/api/ingredients/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        content = gzip.decompress(response.content)
+        self.assertEqual(json.loads(content)[0]['name'], 'Мука 0')
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.assertEqual(
+            cache.get(f'compressed:gzip:{digest}'), response.content)
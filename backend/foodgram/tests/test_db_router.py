@@ -0,0 +1,86 @@
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from foodgram.db_router import PrimaryReplicaRouter, primary_pinned
+from foodgram.middleware import PRIMARY_PIN_COOKIE, PrimaryPinningMiddleware
+
+router = PrimaryReplicaRouter()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def test_reads_go_to_replica(self):
+        self.assertEqual(router.db_for_read(None), 'replica_0')
+        self.assertEqual(router.db_for_write(None), 'default')
+
+    def test_pinned_reads_go_to_primary(self):
+        token = primary_pinned.set(True)
+        try:
+            self.assertEqual(router.db_for_read(None), 'default')
+        finally:
+            primary_pinned.reset(token)
+
+    def test_reads_in_transaction_go_to_primary(self):
+        connection = connections['default']
+        connection.in_atomic_block = True
+        try:
+            self.assertEqual(router.db_for_read(None), 'default')
+        finally:
+            connection.in_atomic_block = False
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(router.db_for_read(None), 'default')
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(router.allow_migrate('default', 'recipes'))
+        self.assertFalse(router.allow_migrate('replica_0', 'recipes'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'],
+                   READ_YOUR_WRITES_SECONDS=5)
+class PrimaryPinningMiddlewareTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def handle(self, request, status=200):
+        databases = []
+
+        def get_response(request):
+            databases.append(router.db_for_read(None))
+            return HttpResponse(status=status)
+
+        response = PrimaryPinningMiddleware(get_response)(request)
+        return databases[0], response
+
+    def test_safe_request_reads_from_replica(self):
+        database, response = self.handle(self.factory.get('/api/recipes/'))
+        self.assertEqual(database, 'replica_0')
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertFalse(primary_pinned.get())
+
+    def test_write_pins_to_primary_and_sets_cookie(self):
+        for method in ('post', 'put', 'patch', 'delete'):
+            request = getattr(self.factory, method)('/api/recipes/')
+            database, response = self.handle(request)
+            self.assertEqual(database, 'default')
+            cookie = response.cookies[PRIMARY_PIN_COOKIE]
+            self.assertEqual(cookie['max-age'], 5)
+            self.assertTrue(cookie['httponly'])
+        self.assertFalse(primary_pinned.get())
+
+    def test_failed_write_sets_no_cookie(self):
+        _, response = self.handle(
+            self.factory.post('/api/recipes/'), status=400)
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    def test_cookie_pins_reads_to_primary(self):
+        request = self.factory.get('/api/recipes/')
+        request.COOKIES[PRIMARY_PIN_COOKIE] = '1'
+        database, response = self.handle(request)
+        self.assertEqual(database, 'default')
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_cookie_without_replicas(self):
+        _, response = self.handle(self.factory.post('/api/recipes/'))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
@@ -0,0 +1,82 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+CONFIG_PATH = Path(settings.BASE_DIR) / 'gunicorn.conf.py'
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = os.path.join(directory.name, 'prometheus')
+        patcher = mock.patch.dict(
+            os.environ, {'PROMETHEUS_MULTIPROC_DIR': self.metrics_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load_config(self, **environ):
+        spec = importlib.util.spec_from_file_location(
+            'gunicorn_conf', CONFIG_PATH)
+        config = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(os.environ, environ):
+            spec.loader.exec_module(config)
+        return config
+
+    def get_server(self, preload_app):
+        return mock.Mock(cfg=mock.Mock(preload_app=preload_app))
+
+    def test_defaults_and_overrides(self):
+        config = self.load_config()
+        self.assertEqual(config.workers, 1)
+        self.assertTrue(config.preload_app)
+        config = self.load_config(
+            GUNICORN_WORKERS='4', GUNICORN_PRELOAD='False')
+        self.assertEqual(config.workers, 4)
+        self.assertFalse(config.preload_app)
+
+    def test_on_starting_clears_metrics_directory(self):
+        config = self.load_config()
+        os.makedirs(self.metrics_dir)
+        stale = os.path.join(self.metrics_dir, 'counter_1.db')
+        Path(stale).touch()
+        config.on_starting(self.get_server(True))
+        self.assertTrue(os.path.isdir(self.metrics_dir))
+        self.assertFalse(os.path.exists(stale))
+
+    def test_post_fork_closes_inherited_connections(self):
+        config = self.load_config()
+        connection = mock.Mock()
+        with mock.patch('django.db.connections') as connections:
+            connections.all.return_value = [connection]
+            config.post_fork(self.get_server(False), mock.Mock())
+            connection.close.assert_not_called()
+            config.post_fork(self.get_server(True), mock.Mock())
+        connection.close.assert_called_once_with()
+
+    def test_child_exit_marks_worker_dead(self):
+        config = self.load_config()
+        with mock.patch(
+            'prometheus_client.multiprocess.mark_process_dead'
+        ) as mark_process_dead:
+            config.child_exit(self.get_server(True), mock.Mock(pid=42))
+        mark_process_dead.assert_called_once_with(42)
+
+
+class BootImportsTests(SimpleTestCase):
+    def test_heavy_modules_are_not_imported_at_boot(self):
+        script = (
+            'import sys, django; django.setup(); import foodgram.wsgi; '
+            'print(sorted({"numpy", "scipy", "reportlab"} & set(sys.modules)))'
+        )
+        process = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, check=True)
+        self.assertEqual(process.stdout.strip(), '[]')
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends import memcached
+from django.test import TestCase
+from django.urls import resolve
+from foodgram.cache_backends import PyMemcacheCache
+from prometheus_client import REGISTRY
+from recipes.models import Tag
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.view = resolve('/api/tags/').view_name
+
+    def test_request_and_query_metrics(self):
+        Tag.objects.create(name='Обед', slug='lunch')
+        requests = get_sample(
+            'foodgram_http_requests_total',
+            view=self.view, method='GET', status='200')
+        queries = get_sample(
+            'foodgram_db_queries_total', view=self.view, alias='default')
+        latency = get_sample(
+            'foodgram_http_request_duration_seconds_count',
+            view=self.view, method='GET')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.get('/api/tags/').status_code, 200)
+        self.assertEqual(get_sample(
+            'foodgram_http_requests_total',
+            view=self.view, method='GET', status='200'), requests + 1)
+        self.assertGreater(get_sample(
+            'foodgram_db_queries_total', view=self.view, alias='default'),
+            queries)
+        self.assertEqual(get_sample(
+            'foodgram_http_request_duration_seconds_count',
+            view=self.view, method='GET'), latency + 1)
+        self.client.get('/missing/')
+        self.assertGreater(get_sample(
+            'foodgram_http_requests_total',
+            view='unmatched', method='GET', status='404'), 0)
+
+    def test_cache_metrics(self):
+        hits = get_sample(
+            'foodgram_cache_requests_total', cache='locmem', result='hit')
+        misses = get_sample(
+            'foodgram_cache_requests_total', cache='locmem', result='miss')
+        cache.set('metrics-test', None)
+        self.assertIsNone(cache.get('metrics-test', 'default'))
+        self.assertEqual(cache.get('metrics-missing', 'default'), 'default')
+        self.assertEqual(cache.get_many(['metrics-test', 'metrics-none']),
+                         {'metrics-test': None})
+        self.assertEqual(get_sample(
+            'foodgram_cache_requests_total', cache='locmem', result='hit'),
+            hits + 2)
+        self.assertEqual(get_sample(
+            'foodgram_cache_requests_total', cache='locmem', result='miss'),
+            misses + 2)
+
+    def test_memcached_get_many_metrics(self):
+        backend = PyMemcacheCache('127.0.0.1:11211', {})
+        hits = get_sample(
+            'foodgram_cache_requests_total', cache='memcached', result='hit')
+        misses = get_sample(
+            'foodgram_cache_requests_total', cache='memcached', result='miss')
+        with mock.patch.object(
+            memcached.PyMemcacheCache, 'get_many', return_value={'a': 1}
+        ):
+            self.assertEqual(backend.get_many(['a', 'b', 'c']), {'a': 1})
+        self.assertEqual(get_sample(
+            'foodgram_cache_requests_total', cache='memcached', result='hit'),
+            hits + 1)
+        self.assertEqual(get_sample(
+            'foodgram_cache_requests_total', cache='memcached',
+            result='miss'), misses + 2)
+
+    def test_metrics_endpoint(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            b'foodgram_http_requests_total', response.content)
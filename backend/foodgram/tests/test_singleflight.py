@@ -0,0 +1,38 @@
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from foodgram.singleflight import CacheSingleFlight
+
+
+class CacheSingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.flight = CacheSingleFlight()
+
+    def test_follower_receives_leader_result(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def leader():
+            started.set()
+            release.wait(5)
+            calls.append('leader')
+            return 'result'
+
+        thread = threading.Thread(
+            target=self.flight.do, args=('key', leader, 5))
+        thread.start()
+        started.wait(5)
+        threading.Timer(0.1, release.set).start()
+        result = self.flight.do('key', lambda: calls.append('follower'), 5)
+        thread.join()
+        self.assertEqual(result, 'result')
+        self.assertEqual(calls, ['leader'])
+
+    def test_runs_function_after_leader_failure(self):
+        cache.add('single-flight:lock:key', 1, 5)
+        threading.Timer(
+            0.1, cache.delete, args=('single-flight:lock:key',)).start()
+        self.assertEqual(self.flight.do('key', lambda: 'own', 5), 'own')
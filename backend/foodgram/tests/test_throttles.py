@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from foodgram.throttles import AnonScopedRateThrottle
+from recipes.tests.factories import create_user
+from rest_framework.test import APIClient
+
+URL = '/api/ingredients/'
+
+
+@mock.patch.object(
+    AnonScopedRateThrottle, 'THROTTLE_RATES', {'ingredients': '1/min'})
+class AnonScopedRateThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(REMOTE_ADDR='172.18.0.5')
+
+    def get(self, forwarded_for):
+        return self.client.get(URL, HTTP_X_FORWARDED_FOR=forwarded_for)
+
+    def test_clients_behind_proxy_have_separate_limits(self):
+        self.assertEqual(self.get('10.0.0.1').status_code, 200)
+        self.assertEqual(self.get('10.0.0.1').status_code, 429)
+        self.assertEqual(self.get('10.0.0.2').status_code, 200)
+
+    def test_forged_forwarded_for_is_ignored(self):
+        self.assertEqual(self.get('10.0.0.1').status_code, 200)
+        self.assertEqual(self.get('1.2.3.4, 10.0.0.1').status_code, 429)
+
+    def test_authenticated_users_are_not_throttled(self):
+        self.client.force_authenticate(create_user('user'))
+        self.assertEqual(self.get('10.0.0.1').status_code, 200)
+        self.assertEqual(self.get('10.0.0.1').status_code, 200)
@@ -0,0 +1,8 @@
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class AnonScopedRateThrottle(ScopedRateThrottle):
+    def allow_request(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return True
+        return super().allow_request(request, view)
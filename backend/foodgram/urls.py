@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
+from foodgram.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls', namespace='api')),
     path('', include('recipes.urls')),
 ]
+
+if settings.METRICS_ENABLED:
+    urlpatterns.insert(0, path('metrics', metrics_view))
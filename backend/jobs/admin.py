@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'name', 'status', 'attempts', 'user', 'available_at',
+        'updated_at'
+    )
+    list_filter = ('status', 'name')
+    list_select_related = ('user',)
+    search_fields = ('name',)
+    show_full_result_count = False
+
+
+admin.site.register(Job, JobAdmin)
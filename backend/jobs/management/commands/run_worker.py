@@ -0,0 +1,62 @@
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections
+from foodgram.db_router import primary_pinned
+from jobs.registry import (claim_job, prune_jobs, run_job,
+                           schedule_periodic_jobs)
+
+
+class Command(BaseCommand):
+    help = 'Обработчик фоновых задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить доступные задачи и завершиться'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, с'
+        )
+
+    def handle(self, *args, **options):
+        token = primary_pinned.set(True)
+        try:
+            self.run(options['once'], options['sleep'])
+        finally:
+            primary_pinned.reset(token)
+
+    def run(self, once, sleep):
+        worker_name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Обработчик {worker_name} запущен')
+        pruned_at = scheduled_at = None
+        while True:
+            close_old_connections()
+            try:
+                job = claim_job(worker_name)
+            except OperationalError as error:
+                self.stderr.write(f'База данных недоступна: {error}')
+                time.sleep(sleep)
+                continue
+            if job is None:
+                if (scheduled_at is None or time.monotonic() - scheduled_at
+                        > settings.JOBS_SCHEDULE_INTERVAL):
+                    schedule_periodic_jobs()
+                    scheduled_at = time.monotonic()
+                if (pruned_at is None or time.monotonic() - pruned_at
+                        > settings.JOBS_PRUNE_INTERVAL):
+                    prune_jobs()
+                    pruned_at = time.monotonic()
+                if once:
+                    return
+                time.sleep(sleep)
+                continue
+            job = run_job(job)
+            self.stdout.write(str(job))
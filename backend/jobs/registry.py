@@ -0,0 +1,133 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, user=None, max_attempts=None, delay=0):
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача {name}')
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        user=user,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def schedule_periodic_jobs():
+    now = timezone.now()
+    scheduled = []
+    for name, interval in settings.JOBS_PERIODIC.items():
+        if not interval:
+            continue
+        recent = Job.objects.filter(name=name).filter(
+            Q(status__in=(Job.PENDING, Job.RUNNING))
+            | Q(created_at__gt=now - timedelta(seconds=interval))
+        )
+        if not recent.exists():
+            scheduled.append(enqueue(name))
+    return scheduled
+
+
+def fail_expired_jobs(now):
+    return Job.objects.filter(
+        status=Job.RUNNING,
+        locked_until__lt=now,
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.FAILED,
+        locked_until=None,
+        error='Обработчик не завершил задачу за отведённое время',
+        updated_at=now,
+    )
+
+
+def claim_job(worker_name):
+    now = timezone.now()
+    fail_expired_jobs(now)
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.PENDING)
+                | Q(status=Job.RUNNING, locked_until__lt=now,
+                    attempts__lt=F('max_attempts')),
+                available_at__lte=now,
+            )
+            .order_by('available_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(
+            pk=job.pk, status=job.status, locked_until=job.locked_until
+        ).update(
+            status=Job.RUNNING,
+            attempts=job.attempts + 1,
+            locked_by=worker_name,
+            locked_until=now + timedelta(
+                seconds=settings.JOBS_VISIBILITY_TIMEOUT),
+            updated_at=now,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    try:
+        result = TASKS[job.name](**job.payload)
+    except Exception:
+        logger.exception('Задача %s #%s завершилась ошибкой', job.name, job.id)
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.available_at = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ''
+    job.locked_until = None
+    job.save(update_fields=(
+        'status', 'result', 'error', 'available_at', 'locked_until',
+        'updated_at'
+    ))
+    return job
+
+
+def prune_jobs(batch_size=1000):
+    finished = Job.objects.filter(
+        status__in=(Job.SUCCEEDED, Job.FAILED),
+        updated_at__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_RETENTION),
+    )
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,127 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from foodgram.db_router import primary_pinned
+from jobs.models import Job
+from jobs.registry import (claim_job, enqueue, prune_jobs, run_job,
+                           schedule_periodic_jobs, task)
+
+calls = []
+
+
+@task('tests.record')
+def record_task(value=None):
+    calls.append((value, primary_pinned.get()))
+    return {'value': value}
+
+
+@task('tests.fail')
+def fail_task():
+    raise ValueError('Ошибка')
+
+
+@override_settings(JOBS_RETRY_DELAY=0)
+class JobRegistryTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        # TestCase держит транзакцию открытой, а close_old_connections()
+        # закрыл бы такое соединение.
+        patcher = mock.patch(
+            'jobs.management.commands.run_worker.close_old_connections')
+        self.close_old_connections = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_claim_and_run(self):
+        enqueue('tests.record', {'value': 1})
+        job = run_job(claim_job('worker'))
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {'value': 1})
+        self.assertIsNone(claim_job('worker'))
+
+    def test_failed_job_retries_until_max_attempts(self):
+        enqueue('tests.fail', max_attempts=2)
+        with self.assertLogs('jobs.registry', 'ERROR'):
+            job = run_job(claim_job('worker'))
+            self.assertEqual(job.status, Job.PENDING)
+            job = run_job(claim_job('worker'))
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('ValueError', job.error)
+        self.assertIsNone(claim_job('worker'))
+
+    def test_expired_running_job(self):
+        job = enqueue('tests.record', max_attempts=2)
+        expired = timezone.now() - timedelta(seconds=1)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, attempts=1, locked_until=expired)
+        reclaimed = claim_job('worker')
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+        Job.objects.filter(pk=job.pk).update(locked_until=expired)
+        self.assertIsNone(claim_job('worker'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIsNone(job.locked_until)
+
+    @override_settings(JOBS_RETENTION=3600)
+    def test_prune_finished_jobs(self):
+        old = timezone.now() - timedelta(hours=2)
+        kept = [
+            enqueue('tests.record').pk,
+            Job.objects.create(
+                name='tests.record', max_attempts=1, status=Job.SUCCEEDED).pk,
+        ]
+        pruned = [
+            Job.objects.create(
+                name='tests.record', max_attempts=1, status=status).pk
+            for status in (Job.SUCCEEDED, Job.FAILED)
+        ]
+        Job.objects.filter(pk__in=pruned + kept[:1]).update(updated_at=old)
+        self.assertEqual(prune_jobs(batch_size=1), 2)
+        self.assertEqual(
+            sorted(Job.objects.values_list('pk', flat=True)), sorted(kept))
+
+    def test_worker_reads_from_primary(self):
+        enqueue('tests.record', {'value': 2})
+        call_command('run_worker', once=True, stdout=io.StringIO())
+        self.assertEqual(calls, [(2, True)])
+        self.assertFalse(primary_pinned.get())
+
+    @override_settings(JOBS_PERIODIC={'tests.record': 3600, 'tests.fail': 0})
+    def test_periodic_jobs_are_debounced(self):
+        [job] = schedule_periodic_jobs()
+        self.assertEqual(job.name, 'tests.record')
+        self.assertEqual(schedule_periodic_jobs(), [])
+        run_job(claim_job('worker'))
+        self.assertEqual(schedule_periodic_jobs(), [])
+        Job.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(len(schedule_periodic_jobs()), 1)
+
+    def test_worker_schedules_change_log_prune(self):
+        call_command('run_worker', once=True, stdout=io.StringIO())
+        self.assertTrue(Job.objects.filter(
+            name='changes.prune', status=Job.PENDING).exists())
+
+    def test_worker_survives_database_errors(self):
+        enqueue('tests.record', {'value': 3})
+        errors = [OperationalError('down')]
+
+        def flaky_claim_job(worker_name):
+            if errors:
+                raise errors.pop()
+            return claim_job(worker_name)
+
+        stderr = io.StringIO()
+        with mock.patch(
+            'jobs.management.commands.run_worker.claim_job', flaky_claim_job
+        ):
+            call_command('run_worker', once=True, sleep=0,
+                         stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('База данных недоступна', stderr.getvalue())
+        self.assertEqual(self.close_old_connections.call_count, 3)
+        self.assertEqual(calls, [(3, True)])
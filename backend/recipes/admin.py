@@ -1,24 +1,48 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.html import mark_safe
 
-from .models import (Favorite, Ingredient, IngredientAmount, Recipe,
-                     ShoppingCart, Subscribe, Tag, UserProfile)
+from .models import (Favorite, Ingredient, IngredientAmount, MealPlanEntry,
+                     Recipe, ShoppingCart, Subscribe, Tag, UserProfile)
+
+
+def count_subquery(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects
+            .filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
 
 
 class CountRecipesMixin:
     list_display = ('recipe_count',)
+    recipes_relation = None
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            recipes_count=count_subquery(*self.recipes_relation)
+        )
 
     @admin.display(
         description='Рецепты',
-        ordering='recipes__count'
+        ordering='recipes_count'
     )
     def recipe_count(self, obj):
-        return obj.recipes.count()
+        return obj.recipes_count
 
 
 class SubscribeAdmin(admin.ModelAdmin):
     list_display = ('id', 'follower', 'following')
+    list_select_related = ('follower', 'following')
+    show_full_result_count = False
     list_filter = ('following', 'follower')
     search_fields = (
         'follower__username',
@@ -27,6 +51,8 @@ class SubscribeAdmin(admin.ModelAdmin):
 
 
 class UserProfileAdmin(CountRecipesMixin, UserAdmin):
+    recipes_relation = (Recipe, 'author')
+    show_full_result_count = False
     fieldsets = UserAdmin.fieldsets + (
         ('Дополнительно', {
             'fields': (
@@ -56,21 +82,24 @@ class UserProfileAdmin(CountRecipesMixin, UserAdmin):
         return "Нет аватара"
     avatar_tag.short_description = 'Аватар'
 
-    @admin.display(description='Подписки')
+    @admin.display(description='Подписки', ordering='subscriptions_count')
     def get_subscriptions_count(self, obj):
-        return obj.authors.count()
+        return obj.subscriptions_count
 
-    @admin.display(description='Подписчики')
+    @admin.display(description='Подписчики', ordering='subscribers_count')
     def get_subscribers_count(self, obj):
-        return obj.followers.count()
+        return obj.subscribers_count
 
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related(
-            'authors', 'followers'
+        return super().get_queryset(request).annotate(
+            subscriptions_count=count_subquery(Subscribe, 'following'),
+            subscribers_count=count_subquery(Subscribe, 'follower'),
         )
 
 
 class IngredientAdmin(CountRecipesMixin, admin.ModelAdmin):
+    recipes_relation = (IngredientAmount, 'ingredient')
+    show_full_result_count = False
     list_display = (
         'id', 'name', 'measurement_unit', *CountRecipesMixin.list_display
     )
@@ -94,6 +123,19 @@ class RecipeAdmin(admin.ModelAdmin):
     )
     list_filter = ('tags', 'author__username',)
     search_fields = ('name__icontains', 'author__username__icontains')
+    list_select_related = ('author',)
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            favorites_count=count_subquery(Favorite, 'recipe')
+        ).prefetch_related(
+            Prefetch(
+                'recipe_amounts',
+                queryset=IngredientAmount.objects.select_related('ingredient')
+            ),
+            'tags',
+        )
 
     @admin.display(description='Изображение')
     def image_tag(self, recipe):
@@ -115,7 +157,7 @@ class RecipeAdmin(admin.ModelAdmin):
         ingredients_list = [
             f'- {ing.ingredient.name} '
             f'({ing.amount} {ing.ingredient.measurement_unit})'
-            for ing in recipe.recipe_amounts.select_related('ingredient').all()
+            for ing in recipe.recipe_amounts.all()
         ]
         return mark_safe('<br>'.join(ingredients_list))
 
@@ -128,28 +170,41 @@ class RecipeAdmin(admin.ModelAdmin):
 
     @admin.display(
         description='Лайки',
-        ordering='favorites__count'
+        ordering='favorites_count'
     )
     def count_favorites(self, recipe):
-        return recipe.favorites.count()
+        return recipe.favorites_count
 
 
 class TagAdmin(CountRecipesMixin, admin.ModelAdmin):
+    recipes_relation = (Recipe.tags.through, 'tag')
     list_display = ('id', 'name', 'slug', *CountRecipesMixin.list_display)
 
 
 class ShoppingCartAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'recipe')
+    list_display = ('id', 'user', 'recipe', 'multiplier')
+    list_select_related = ('user', 'recipe')
+    show_full_result_count = False
     search_fields = ('user__username', 'recipe__name')
     list_filter = ('user', 'recipe')
 
 
 class FavoriteAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'recipe')
+    list_select_related = ('user', 'recipe')
+    show_full_result_count = False
     search_fields = ('user__username', 'recipe__name')
     list_filter = ('user', 'recipe')
 
 
+class MealPlanEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'recipe', 'day', 'multiplier')
+    list_select_related = ('user', 'recipe')
+    show_full_result_count = False
+    search_fields = ('user__username', 'recipe__name')
+    list_filter = ('day',)
+
+
 admin.site.register(UserProfile, UserProfileAdmin)
 admin.site.register(Subscribe, SubscribeAdmin)
 admin.site.register(Tag, TagAdmin)
@@ -157,3 +212,4 @@ admin.site.register(Ingredient, IngredientAdmin)
 admin.site.register(Recipe, RecipeAdmin)
 admin.site.register(ShoppingCart, ShoppingCartAdmin)
 admin.site.register(Favorite, FavoriteAdmin)
+admin.site.register(MealPlanEntry, MealPlanEntryAdmin)
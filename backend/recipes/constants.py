@@ -1,2 +1,6 @@
+from decimal import Decimal
+
 MIN_AMOUNT = 1
 MIN_TIME = 1
+MIN_MULTIPLIER = Decimal('0.01')
+NUTRITION_HELP_TEXT = 'На 100 г или 100 мл, для штучных единиц — на одну'
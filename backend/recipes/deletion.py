@@ -0,0 +1,130 @@
+import time
+
+from changes.log import record_queryset
+from changes.models import Change
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from jobs.models import Job
+from jobs.registry import enqueue
+
+from .models import (Favorite, IngredientAmount, MealPlanEntry, Recipe,
+                     ShoppingCart, Subscribe, TimelineEntry)
+from .services import schedule_cart_versions_bump
+from .shortlinks import invalidate_recipes, schedule_short_link_export
+
+User = get_user_model()
+
+RECIPE_DEPENDENTS = (
+    ShoppingCart, MealPlanEntry, Favorite, TimelineEntry, IngredientAmount,
+    Recipe.tags.through,
+)
+USER_DEPENDENTS = (ShoppingCart, MealPlanEntry, Favorite, TimelineEntry)
+RELATION_USER_FIELDS = {
+    Favorite: 'user_id',
+    ShoppingCart: 'user_id',
+    Subscribe: 'follower_id',
+}
+
+relations_deleted = Signal()
+
+
+def schedule_purge():
+    pending = Job.objects.filter(name='deletion.purge', status=Job.PENDING)
+    if not pending.exists():
+        enqueue('deletion.purge', delay=settings.PURGE_JOB_DELAY)
+
+
+def tombstone_recipe(recipe):
+    recipe.deleted_at = timezone.now()
+    recipe.save(update_fields=['deleted_at'])
+    schedule_cart_versions_bump([recipe.id])
+    schedule_purge()
+
+
+def tombstone_user(user):
+    now = timezone.now()
+    recipes = Recipe.objects.filter(author=user)
+    recipe_ids = list(recipes.values_list('id', flat=True))
+    recipes.update(deleted_at=now)
+    record_queryset(
+        Recipe.all_objects.filter(id__in=recipe_ids), Change.UPDATE,
+        ['deleted_at'])
+    invalidate_recipes(recipe_ids)
+    if recipe_ids:
+        schedule_short_link_export()
+    schedule_cart_versions_bump(recipe_ids)
+    user.deleted_at = now
+    user.is_active = False
+    user.save(update_fields=['deleted_at', 'is_active'])
+    schedule_purge()
+
+
+def delete_in_batches(queryset, batch_size, delay, signals=False):
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        batch = queryset.model._base_manager.filter(pk__in=ids)
+        if signals:
+            deleted += batch.delete()[0]
+        else:
+            user_field = RELATION_USER_FIELDS.get(queryset.model)
+            with transaction.atomic():
+                record_queryset(batch, Change.DELETE)
+                user_ids = (
+                    set(batch.values_list(user_field, flat=True))
+                    if user_field else set()
+                )
+                deleted += batch._raw_delete(batch.db)
+            if user_ids:
+                relations_deleted.send(
+                    sender=queryset.model, user_ids=user_ids)
+        time.sleep(delay)
+
+
+def purge_recipe(recipe, batch_size, delay):
+    deleted = sum(
+        delete_in_batches(
+            model.objects.filter(recipe_id=recipe.id), batch_size, delay)
+        for model in RECIPE_DEPENDENTS
+    )
+    return deleted + recipe.delete()[0]
+
+
+def purge_user(user, batch_size, delay):
+    deleted = sum(
+        purge_recipe(recipe, batch_size, delay)
+        for recipe in Recipe.all_objects.filter(author=user).order_by('id')
+    )
+    deleted += sum(
+        delete_in_batches(
+            model.objects.filter(user_id=user.id), batch_size, delay)
+        for model in USER_DEPENDENTS
+    )
+    deleted += delete_in_batches(
+        Subscribe.objects.filter(follower_id=user.id), batch_size, delay,
+        signals=True)
+    deleted += delete_in_batches(
+        Subscribe.objects.filter(following_id=user.id), batch_size, delay)
+    return deleted + user.delete()[0]
+
+
+def purge_deleted(batch_size=None, delay=None):
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    delay = settings.PURGE_BATCH_DELAY if delay is None else delay
+    purged = {'recipes': 0, 'users': 0, 'rows': 0}
+    recipes = Recipe.all_objects.filter(
+        deleted_at__isnull=False, author__deleted_at__isnull=True)
+    for recipe in recipes.order_by('id'):
+        purged['rows'] += purge_recipe(recipe, batch_size, delay)
+        purged['recipes'] += 1
+    users = User.all_objects.filter(deleted_at__isnull=False)
+    for user in users.order_by('id'):
+        purged['recipes'] += Recipe.all_objects.filter(author=user).count()
+        purged['rows'] += purge_user(user, batch_size, delay)
+        purged['users'] += 1
+    return purged
@@ -0,0 +1,90 @@
+import heapq
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from .models import Recipe, Subscribe, TimelineEntry
+from .services import users_updated
+
+User = get_user_model()
+
+
+def fan_out_recipe(recipe_id):
+    recipe = (
+        Recipe.objects.select_related('author').filter(pk=recipe_id).first()
+    )
+    if recipe is None or recipe.author.fanout_on_read:
+        return 0
+    followers = Subscribe.objects.filter(
+        following_id=recipe.author_id
+    ).values_list('follower_id', flat=True)
+    entries = [
+        TimelineEntry(user_id=follower_id, recipe_id=recipe.id)
+        for follower_id in followers.iterator()
+    ]
+    TimelineEntry.objects.bulk_create(
+        entries, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
+
+
+def backfill_timeline(follower_ids, author_id):
+    recipe_ids = list(
+        Recipe.objects
+        .filter(author_id=author_id)
+        .order_by('-id')
+        .values_list('id', flat=True)[:settings.FEED_BACKFILL_SIZE]
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower_id, recipe_id=recipe_id)
+            for follower_id in follower_ids
+            for recipe_id in recipe_ids
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def remove_from_timeline(follower_id, author_id):
+    TimelineEntry.objects.filter(
+        user_id=follower_id, recipe__author_id=author_id
+    ).delete()
+
+
+def update_fanout_mode(author_id):
+    followers = Subscribe.objects.filter(following_id=author_id).count()
+    fanout_on_read = followers > settings.FEED_FANOUT_LIMIT
+    changed = User.objects.filter(pk=author_id).exclude(
+        fanout_on_read=fanout_on_read
+    ).update(fanout_on_read=fanout_on_read)
+    if changed:
+        users_updated.send(sender=User, user_ids=[author_id])
+    return bool(changed) and not fanout_on_read
+
+
+def get_feed(user, before=None, limit=None):
+    limit = limit or settings.FEED_PAGE_SIZE
+    timeline = TimelineEntry.objects.filter(
+        user=user, recipe__deleted_at__isnull=True)
+    popular_recipes = Recipe.objects.filter(
+        author__authors__follower=user, author__fanout_on_read=True
+    )
+    if before is not None:
+        timeline = timeline.filter(recipe_id__lt=before)
+        popular_recipes = popular_recipes.filter(id__lt=before)
+    streams = (
+        timeline.order_by('-recipe_id').values_list('recipe_id', flat=True),
+        popular_recipes.order_by('-id').values_list('id', flat=True),
+    )
+    recipe_ids = []
+    merged = heapq.merge(
+        *(stream[:limit] for stream in streams), reverse=True)
+    for recipe_id in merged:
+        if recipe_ids and recipe_ids[-1] == recipe_id:
+            continue
+        recipe_ids.append(recipe_id)
+        if len(recipe_ids) == limit:
+            break
+    recipes = Recipe.objects.in_bulk(recipe_ids)
+    return [recipes[recipe_id] for recipe_id in recipe_ids
+            if recipe_id in recipes]
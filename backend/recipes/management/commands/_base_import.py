@@ -1,29 +1,82 @@
 import json
 
+from changes.log import record_queryset
+from changes.models import Change
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
 
 
 class BaseImportCommand(BaseCommand):
     model = None
     fields = []
+    lookup_fields = ()
     help_text = ''
 
     def add_arguments(self, parser):
         parser.add_argument('json_file', type=str, help=self.help_text)
 
+    def get_key(self, item):
+        return tuple(item[field] for field in self.lookup_fields)
+
+    def update_existing(self, data):
+        if not self.lookup_fields:
+            return data, []
+        update_fields = sorted(
+            {field for item in data for field in item}
+            - set(self.lookup_fields)
+        )
+        existing = {
+            self.get_key(vars(obj)): obj
+            for obj in self.model.objects.all()
+        }
+        new_items, updated = [], []
+        for item in data:
+            obj = existing.get(self.get_key(item))
+            if obj is None:
+                new_items.append(item)
+                continue
+            changed = {
+                field: value for field, value in item.items()
+                if getattr(obj, field) != value
+            }
+            if not changed:
+                continue
+            for field, value in changed.items():
+                setattr(obj, field, value)
+            updated.append(obj)
+        if updated:
+            self.model.objects.bulk_update(
+                updated, update_fields, batch_size=1000)
+            record_queryset(
+                self.model.objects.filter(pk__in=[obj.pk for obj in updated]),
+                Change.UPDATE, update_fields)
+        return new_items, updated
+
+    def after_import(self, created, updated):
+        pass
+
     def handle(self, *args, **options):
         filename = options['json_file']
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
+            with open(filename, 'r', encoding='utf-8') as f, \
+                    transaction.atomic():
                 data = json.load(f)
+                new_items, updated = self.update_existing(data)
+                last_id = self.model.objects.aggregate(
+                    last_id=Max('pk'))['last_id'] or 0
                 created = self.model.objects.bulk_create(
                     self.model(**item)
-                    for item in data
+                    for item in new_items
                 )
+                record_queryset(
+                    self.model.objects.filter(pk__gt=last_id), Change.CREATE)
+                self.after_import(created, updated)
                 self.stdout.write(
                     self.style.SUCCESS(
                         f'Успешно загружено {len(created)} '
-                        f'записей из {filename}')
+                        f'записей из {filename}, '
+                        f'обновлено {len(updated)}')
                 )
         except Exception as e:
             self.stderr.write(f'Ошибка при обработке файла {filename}: {e}')
@@ -0,0 +1,78 @@
+import random
+import timeit
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from recipes.models import MealPlanEntry, Recipe
+from recipes.services import get_shopping_list_entries, get_shopping_list_items
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Замер агрегации списка покупок для больших планов питания'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, nargs='+', default=[7, 30, 90, 365],
+            help='Длительность планов в днях'
+        )
+        parser.add_argument('--recipes-per-day', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def create_plan(self, user, recipe_ids, days, recipes_per_day):
+        today = date.today()
+        MealPlanEntry.objects.bulk_create(
+            [
+                MealPlanEntry(
+                    user=user,
+                    recipe_id=random.choice(recipe_ids),
+                    day=today + timedelta(days=day),
+                    multiplier=random.choice((1, 2, 4, 8)),
+                )
+                for day in range(days)
+                for _ in range(recipes_per_day)
+            ],
+            batch_size=1000,
+        )
+
+    def measure(self, user, days, repeat):
+        entries = get_shopping_list_entries(
+            user, date.today(), date.today() + timedelta(days=days - 1))
+        with CaptureQueriesContext(connection) as queries:
+            items = get_shopping_list_items(entries)
+        elapsed = min(timeit.repeat(
+            lambda: get_shopping_list_items(entries), number=1, repeat=repeat
+        ))
+        return len(items), len(queries), elapsed
+
+    def handle(self, *args, **options):
+        recipe_ids = list(Recipe.objects.values_list('id', flat=True))
+        if not recipe_ids:
+            raise CommandError('В базе нет рецептов')
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username='benchmark', email='benchmark@example.com')
+                self.create_plan(
+                    user, recipe_ids, max(options['days']),
+                    options['recipes_per_day'])
+                for days in sorted(options['days']):
+                    items, queries, elapsed = self.measure(
+                        user, days, options['repeat'])
+                    self.stdout.write(
+                        f'{days:>4} дн. '
+                        f'{days * options["recipes_per_day"]:>6} записей  '
+                        f'{items:>5} продуктов  {queries} запрос  '
+                        f'{elapsed * 1000:9.2f} мс'
+                    )
+                raise Rollback
+        except Rollback:
+            pass
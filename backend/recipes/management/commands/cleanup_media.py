@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from recipes.media import delete_orphaned_media, delete_stale_exports
+
+
+class Command(BaseCommand):
+    help = 'Удаление файлов, на которые больше не ссылаются рецепты и аватары'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-period',
+            type=int,
+            help='Не удалять файлы моложе указанного числа секунд'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только вывести список файлов'
+        )
+
+    def handle(self, *args, **options):
+        deleted = delete_orphaned_media(
+            options['grace_period'], dry_run=options['dry_run']
+        ) + delete_stale_exports(dry_run=options['dry_run'])
+        for name in deleted:
+            self.stdout.write(name)
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено файлов: {len(deleted)}')
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from recipes.shortlinks import export_short_link_map, get_short_link_map_lines
+
+
+class Command(BaseCommand):
+    help = 'Выгрузка коротких ссылок в формате map для nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Файл для записи (по умолчанию stdout)'
+        )
+
+    def handle(self, *args, **options):
+        filename = options['output']
+        if not filename:
+            for line in get_short_link_map_lines():
+                self.stdout.write(line, ending='')
+            return
+        export_short_link_map(filename)
+        self.stdout.write(
+            self.style.SUCCESS(f'Короткие ссылки выгружены в {filename}')
+        )
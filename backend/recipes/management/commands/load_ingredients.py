@@ -1,3 +1,4 @@
+from jobs.registry import enqueue
 from recipes.models import Ingredient
 
 from ._base_import import BaseImportCommand
@@ -5,4 +6,11 @@ from ._base_import import BaseImportCommand
 
 class Command(BaseImportCommand):
     model = Ingredient
+    lookup_fields = ('name', 'measurement_unit')
     help_text = 'Загрузка ингредиентов из JSON файла'
+
+    def after_import(self, created, updated):
+        if updated:
+            enqueue('recipes.nutrition', {
+                'ingredient_ids': [ingredient.id for ingredient in updated]
+            })
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from recipes.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = 'Пакетное удаление рецептов и пользователей, помеченных удалёнными'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество строк, удаляемых одним запросом'
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            help='Пауза между пакетами в секундах'
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_deleted(options['batch_size'], options['delay'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено рецептов: {purged["recipes"]}, '
+            f'пользователей: {purged["users"]}, строк: {purged["rows"]}'
+        ))
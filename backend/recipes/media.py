@@ -0,0 +1,70 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from foodgram.storage import private_storage
+
+from .models import Recipe
+
+MEDIA_DIRECTORIES = {
+    'users/images': (get_user_model(), 'avatar'),
+    'recipes/images': (Recipe, 'image'),
+}
+PRIVATE_TEMPORARY_DIRECTORIES = ('shopping_lists', 'avatar_uploads')
+
+
+def is_media_referenced(name):
+    return any(
+        model.all_objects.filter(**{field: name}).exists()
+        for model, field in MEDIA_DIRECTORIES.values()
+    )
+
+
+def walk_storage(storage, directory):
+    if not storage.exists(directory):
+        return
+    subdirectories, files = storage.listdir(directory)
+    for filename in files:
+        yield os.path.join(directory, filename)
+    for subdirectory in subdirectories:
+        yield from walk_storage(storage, os.path.join(directory, subdirectory))
+
+
+def delete_orphaned_media(grace_period=None, dry_run=False):
+    if grace_period is None:
+        grace_period = settings.MEDIA_CLEANUP_GRACE_PERIOD
+    threshold = timezone.now() - timedelta(seconds=grace_period)
+    deleted = []
+    for directory, (model, field) in MEDIA_DIRECTORIES.items():
+        referenced = set(
+            model.all_objects
+            .exclude(**{field: ''})
+            .values_list(field, flat=True)
+        )
+        for name in walk_storage(default_storage, directory):
+            if name in referenced:
+                continue
+            if default_storage.get_modified_time(name) > threshold:
+                continue
+            if not dry_run:
+                default_storage.delete(name)
+            deleted.append(name)
+    return deleted
+
+
+def delete_stale_exports(max_age=None, dry_run=False):
+    if max_age is None:
+        max_age = settings.SHOPPING_LIST_EXPORT_MAX_AGE
+    threshold = timezone.now() - timedelta(seconds=max_age)
+    deleted = []
+    for directory in PRIVATE_TEMPORARY_DIRECTORIES:
+        for name in walk_storage(private_storage, directory):
+            if private_storage.get_modified_time(name) > threshold:
+                continue
+            if not dry_run:
+                private_storage.delete(name)
+            deleted.append(name)
+    return deleted
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.3 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='recipe',
+            options={'ordering': ['-id'], 'verbose_name': 'Рецепт', 'verbose_name_plural': 'Рецепты'},
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='fragment',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Готовое представление'),
+        ),
+    ]
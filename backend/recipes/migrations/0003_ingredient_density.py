@@ -0,0 +1,19 @@
+# Generated by Django 3.2.3 on 2026-10-19 09:57
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_recipe_fragment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='density',
+            field=models.FloatField(blank=True, help_text='Для пересчёта объёмных единиц в граммы', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Плотность (г/мл)'),
+        ),
+    ]
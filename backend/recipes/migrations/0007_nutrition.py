@@ -0,0 +1,54 @@
+# Generated by Django 3.2.3 on 2026-10-19 10:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_meal_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='calories',
+            field=models.FloatField(blank=True, help_text='На 100 г или 100 мл, для штучных единиц — на одну', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Калорийность (ккал)'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='carbohydrates',
+            field=models.FloatField(blank=True, help_text='На 100 г или 100 мл, для штучных единиц — на одну', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Углеводы (г)'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='fats',
+            field=models.FloatField(blank=True, help_text='На 100 г или 100 мл, для штучных единиц — на одну', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Жиры (г)'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='proteins',
+            field=models.FloatField(blank=True, help_text='На 100 г или 100 мл, для штучных единиц — на одну', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Белки (г)'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='calories',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True, verbose_name='Калорийность (ккал)'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='carbohydrates',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Углеводы (г)'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='fats',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Жиры (г)'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='proteins',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Белки (г)'),
+        ),
+    ]
@@ -1,10 +1,24 @@
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core import validators
 from django.core.validators import RegexValidator
 from django.db import models
 
-from .constants import MIN_AMOUNT, MIN_TIME
+from .constants import (MIN_AMOUNT, MIN_MULTIPLIER, MIN_TIME,
+                        NUTRITION_HELP_TEXT)
+
+
+class NotDeletedManagerMixin:
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class UserProfileManager(NotDeletedManagerMixin, UserManager):
+    pass
+
+
+class RecipeManager(NotDeletedManagerMixin, models.Manager):
+    pass
 
 
 class UserProfile(AbstractUser):
@@ -29,6 +43,26 @@ class UserProfile(AbstractUser):
         default=None,
         verbose_name='Аватар',
     )
+    cart_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия списка покупок',
+    )
+    fanout_on_read = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Лента подписчиков собирается при чтении',
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Удалён',
+    )
+
+    objects = UserProfileManager()
+    all_objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name', 'username']
@@ -95,6 +129,41 @@ class Ingredient(models.Model):
                             verbose_name="Название")
     measurement_unit = models.CharField(max_length=64,
                                         verbose_name="Единица измерения")
+    density = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0)],
+        verbose_name='Плотность (г/мл)',
+        help_text='Для пересчёта объёмных единиц в граммы',
+    )
+    calories = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0)],
+        verbose_name='Калорийность (ккал)',
+        help_text=NUTRITION_HELP_TEXT,
+    )
+    proteins = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0)],
+        verbose_name='Белки (г)',
+        help_text=NUTRITION_HELP_TEXT,
+    )
+    fats = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0)],
+        verbose_name='Жиры (г)',
+        help_text=NUTRITION_HELP_TEXT,
+    )
+    carbohydrates = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[validators.MinValueValidator(0)],
+        verbose_name='Углеводы (г)',
+        help_text=NUTRITION_HELP_TEXT,
+    )
 
     class Meta:
         verbose_name = "Продукт"
@@ -149,6 +218,51 @@ class Recipe(models.Model):
         related_name='recipes',
         verbose_name='Теги',
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+    )
+    fragment = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Готовое представление',
+    )
+    calories = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Калорийность (ккал)',
+    )
+    proteins = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Белки (г)',
+    )
+    fats = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Жиры (г)',
+    )
+    carbohydrates = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Углеводы (г)',
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Удалён',
+    )
+
+    objects = RecipeManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['-id']
@@ -229,6 +343,55 @@ class Favorite(RecipeUserRelation):
 
 
 class ShoppingCart(RecipeUserRelation):
+    multiplier = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=1,
+        validators=(validators.MinValueValidator(MIN_MULTIPLIER),),
+        verbose_name='Множитель порций',
+    )
+
     class Meta (RecipeUserRelation.Meta):
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Списки покупок'
+
+
+class TimelineEntry(RecipeUserRelation):
+    class Meta (RecipeUserRelation.Meta):
+        ordering = ['-recipe_id']
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+
+
+class MealPlanEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='meal_plan',
+        verbose_name='Пользователь',
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='meal_plan_entries',
+        verbose_name='Рецепт',
+    )
+    day = models.DateField(verbose_name='День')
+    multiplier = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=1,
+        validators=(validators.MinValueValidator(MIN_MULTIPLIER),),
+        verbose_name='Множитель порций',
+    )
+
+    class Meta:
+        ordering = ['day', 'id']
+        verbose_name = 'План питания'
+        verbose_name_plural = 'Планы питания'
+        indexes = [
+            models.Index(fields=['user', 'day'], name='meal_plan_user_day_idx')
+        ]
+
+    def __str__(self):
+        return f'{self.user} → {self.recipe} ({self.day})'
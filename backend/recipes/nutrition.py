@@ -0,0 +1,106 @@
+import threading
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from .models import Ingredient, IngredientAmount, Recipe
+from .units import GRAM, MILLILITER, to_canonical
+
+NUTRIENTS = ('calories', 'proteins', 'fats', 'carbohydrates')
+NUTRITION_BASE = 100
+
+_pending = threading.local()
+
+nutrition_updated = Signal()
+
+
+def nutrition_weight(amount, unit, density):
+    amount, unit = to_canonical(amount, unit, density)
+    if unit in (GRAM, MILLILITER):
+        return amount / NUTRITION_BASE
+    return amount
+
+
+def compute_nutrition(recipe_ids):
+    import numpy as np
+    from scipy import sparse
+
+    recipe_index = {recipe_id: row for row, recipe_id in enumerate(recipe_ids)}
+    amounts = list(
+        IngredientAmount.objects
+        .filter(recipe_id__in=recipe_ids)
+        .values_list(
+            'recipe_id', 'ingredient_id', 'amount',
+            'ingredient__measurement_unit', 'ingredient__density',
+        )
+    )
+    ingredient_ids = sorted({amount[1] for amount in amounts})
+    ingredient_index = {
+        ingredient_id: column
+        for column, ingredient_id in enumerate(ingredient_ids)
+    }
+    weights = sparse.csr_matrix(
+        (
+            [nutrition_weight(amount, unit, density)
+             for _, _, amount, unit, density in amounts],
+            (
+                [recipe_index[amount[0]] for amount in amounts],
+                [ingredient_index[amount[1]] for amount in amounts],
+            ),
+        ),
+        shape=(len(recipe_ids), len(ingredient_ids)),
+        dtype=float,
+    )
+    values = {
+        row[0]: row[1:] for row in
+        Ingredient.objects
+        .filter(id__in=ingredient_ids)
+        .values_list('id', *NUTRIENTS)
+    }
+    nutrition = np.array(
+        [values[ingredient_id] for ingredient_id in ingredient_ids],
+        dtype=float,
+    ).reshape(len(ingredient_ids), len(NUTRIENTS))
+    missing = np.isnan(nutrition)
+    totals = weights @ np.where(missing, 0, nutrition)
+    incomplete = (weights != 0).astype(float) @ missing.astype(float) > 0
+    totals[incomplete] = np.nan
+    totals[weights.getnnz(axis=1) == 0] = np.nan
+    return {
+        recipe_id: {
+            nutrient: None if np.isnan(value) else round(float(value), 2)
+            for nutrient, value in zip(NUTRIENTS, totals[row])
+        }
+        for recipe_id, row in recipe_index.items()
+    }
+
+
+def recompute_nutrition(recipe_ids, batch_size=1000):
+    recipe_ids = list(recipe_ids)
+    for start in range(0, len(recipe_ids), batch_size):
+        batch = recipe_ids[start:start + batch_size]
+        totals = compute_nutrition(batch)
+        recipes = [
+            Recipe(id=recipe_id, **totals[recipe_id]) for recipe_id in batch
+        ]
+        Recipe.objects.bulk_update(recipes, NUTRIENTS)
+    if recipe_ids:
+        nutrition_updated.send(sender=Recipe, recipe_ids=recipe_ids)
+    return len(recipe_ids)
+
+
+def _recompute_pending():
+    recipe_ids = getattr(_pending, 'recipe_ids', None)
+    if not recipe_ids:
+        return
+    _pending.recipe_ids = set()
+    recompute_nutrition(
+        Recipe.objects.filter(id__in=recipe_ids).values_list('id', flat=True)
+    )
+
+
+def schedule_nutrition_recompute(recipe_ids):
+    if not hasattr(_pending, 'recipe_ids'):
+        _pending.recipe_ids = set()
+    _pending.recipe_ids.update(recipe_ids)
+    transaction.on_commit(_recompute_pending)
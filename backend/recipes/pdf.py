@@ -0,0 +1,106 @@
+import io
+from functools import lru_cache
+
+from django.conf import settings
+
+FONT_NAME = 'ShoppingListSans'
+BOLD_FONT_NAME = 'ShoppingListSans-Bold'
+
+
+@lru_cache(maxsize=None)
+def get_layout():
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    pdfmetrics.registerFont(
+        TTFont(FONT_NAME, settings.SHOPPING_LIST_PDF_FONT))
+    pdfmetrics.registerFont(
+        TTFont(BOLD_FONT_NAME, settings.SHOPPING_LIST_PDF_BOLD_FONT))
+    width, height = A4
+    margin = 20 * mm
+    return {
+        'page_size': A4,
+        'left': margin,
+        'top': height - margin,
+        'bottom': margin,
+        'width': width - 2 * margin,
+        'font_size': 11,
+        'title_size': 18,
+        'leading': 16,
+        'string_width': pdfmetrics.stringWidth,
+    }
+
+
+def wrap_line(text, layout, font_name, indent=0):
+    words = text.split()
+    lines, current = [], ''
+    max_width = layout['width'] - indent
+    for word in words:
+        candidate = f'{current} {word}'.strip()
+        if layout['string_width'](
+                candidate, font_name, layout['font_size']) <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        current = word
+    lines.append(current)
+    return lines
+
+
+class ShoppingListPage:
+    def __init__(self, canvas, layout):
+        self.canvas = canvas
+        self.layout = layout
+        self.y = layout['top']
+
+    def ensure_space(self, height):
+        if self.y - height >= self.layout['bottom']:
+            return
+        self.canvas.showPage()
+        self.y = self.layout['top']
+
+    def write(self, text, font_name=FONT_NAME, size=None, indent=0):
+        layout = self.layout
+        size = size or layout['font_size']
+        for line in wrap_line(text, layout, font_name, indent):
+            self.ensure_space(layout['leading'])
+            self.canvas.setFont(font_name, size)
+            self.canvas.drawString(layout['left'] + indent, self.y, line)
+            self.y -= layout['leading']
+
+    def skip(self):
+        self.y -= self.layout['leading'] / 2
+
+
+def render_shopping_list_pdf(context):
+    from reportlab.pdfgen.canvas import Canvas
+
+    layout = get_layout()
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, pagesize=layout['page_size'])
+    canvas.setTitle('Список покупок')
+    page = ShoppingListPage(canvas, layout)
+    page.write(
+        'Список покупок', BOLD_FONT_NAME, size=layout['title_size'])
+    page.write(f'Дата: {context["date"]}')
+    page.skip()
+    page.write('Ингредиенты:', BOLD_FONT_NAME)
+    for number, item in enumerate(context['ingredients'], start=1):
+        page.write(
+            f'{number}. {item["name"].capitalize()} — '
+            f'{item["amount"]} {item["measurement_unit"]}',
+            indent=10,
+        )
+    page.skip()
+    page.write('Рецепты:', BOLD_FONT_NAME)
+    for recipe in context['recipes']:
+        page.write(
+            f'— {recipe["recipe__name"]} '
+            f'@{recipe["recipe__author__username"]}',
+            indent=10,
+        )
+    canvas.save()
+    return buffer.getvalue()
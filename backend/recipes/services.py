@@ -1,45 +1,173 @@
+import base64
+import threading
 from datetime import date
 
-from django.db.models import Sum
-from django.template.loader import render_to_string
-from recipes.models import IngredientAmount, ShoppingCart
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast
+from django.dispatch import Signal
+from foodgram.storage import private_storage
+from recipes.models import MealPlanEntry, Recipe, ShoppingCart, Tag
+from recipes.pdf import render_shopping_list_pdf
+from recipes.units import canonical_amount_annotations, humanize_amount
 
+_pending_cart_recipes = threading.local()
 
-def generate_shopping_list(user):
-    recipes_in_cart = (
-        ShoppingCart.objects
-        .filter(user=user)
-        .values_list('recipe', flat=True)
-    )
+users_updated = Signal()
+
+TAG_CATALOG_KEY = 'tag-catalog'
+
+
+def get_tag_catalog():
+    catalog = cache.get(TAG_CATALOG_KEY)
+    if catalog is None:
+        catalog = list(Tag.objects.values('id', 'name', 'slug'))
+        cache.set(
+            TAG_CATALOG_KEY, catalog, settings.TAG_CATALOG_CACHE_TIMEOUT)
+    return catalog
+
+
+def invalidate_tag_catalog():
+    cache.delete(TAG_CATALOG_KEY)
+
+
+def get_popular_tag_filters(limit):
+    recipe_tags = Recipe.tags.through.objects.filter(
+        recipe__deleted_at__isnull=True)
+    singles = recipe_tags.values('tag__slug').annotate(count=Count('id'))
+    pairs = recipe_tags.filter(
+        recipe__tags__slug__gt=F('tag__slug'),
+    ).values('tag__slug', 'recipe__tags__slug').annotate(count=Count('id'))
+    facets = [
+        ((row['tag__slug'],), row['count']) for row in singles
+    ] + [
+        ((row['tag__slug'], row['recipe__tags__slug']), row['count'])
+        for row in pairs
+    ]
+    facets.sort(key=lambda facet: (-facet[1], len(facet[0]), facet[0]))
+    return [list(slugs) for slugs, count in facets[:limit]]
+
+
+def get_shopping_list_entries(user, start=None, end=None):
+    if start is None and end is None:
+        return ShoppingCart.objects.filter(
+            user=user, recipe__deleted_at__isnull=True)
+    entries = MealPlanEntry.objects.filter(
+        user=user, recipe__deleted_at__isnull=True)
+    if start is not None:
+        entries = entries.filter(day__gte=start)
+    if end is not None:
+        entries = entries.filter(day__lte=end)
+    return entries
 
+
+def get_shopping_list_items(entries):
     ingredients = (
-        IngredientAmount.objects
-        .filter(recipe__in=recipes_in_cart)
-        .values(
-            'ingredient__name',
-            'ingredient__measurement_unit'
+        entries
+        .filter(recipe__recipe_amounts__isnull=False)
+        .annotate(**canonical_amount_annotations(
+            'recipe__recipe_amounts__ingredient__'))
+        .values('recipe__recipe_amounts__ingredient__name', 'canonical_unit')
+        .annotate(total=Sum(
+            F('recipe__recipe_amounts__amount')
+            * F('unit_factor')
+            * F('density_factor')
+            * Cast('multiplier', FloatField()),
+            output_field=FloatField(),
+        ))
+        .order_by('recipe__recipe_amounts__ingredient__name',
+                  'canonical_unit')
+    )
+
+    items = []
+    for item in ingredients:
+        amount, unit = humanize_amount(item['total'], item['canonical_unit'])
+        items.append({
+            'name': item['recipe__recipe_amounts__ingredient__name'],
+            'amount': amount,
+            'measurement_unit': unit,
+        })
+    return items
+
+
+def bump_cart_versions(users):
+    user_ids = list(users.values_list('pk', flat=True).distinct())
+    get_user_model().objects.filter(
+        pk__in=user_ids
+    ).update(cart_version=F('cart_version') + 1)
+    users_updated.send(sender=get_user_model(), user_ids=user_ids)
+
+
+def _bump_pending_cart_versions():
+    recipe_ids = getattr(_pending_cart_recipes, 'ids', None)
+    if not recipe_ids:
+        return
+    _pending_cart_recipes.ids = set()
+    bump_cart_versions(get_user_model().objects.filter(
+        Q(shoppingcarts__recipe__in=recipe_ids)
+        | Q(meal_plan__recipe__in=recipe_ids)
+    ))
+
+
+def schedule_cart_versions_bump(recipe_ids):
+    if not hasattr(_pending_cart_recipes, 'ids'):
+        _pending_cart_recipes.ids = set()
+    _pending_cart_recipes.ids.update(recipe_ids)
+    transaction.on_commit(_bump_pending_cart_versions)
+
+
+def get_shopping_cart_summary(user, since=None):
+    with transaction.atomic():
+        version = (
+            get_user_model().objects
+            .select_for_update(no_key=True)
+            .values_list('cart_version', flat=True)
+            .get(pk=user.pk)
         )
-        .annotate(total=Sum('amount'))
-        .order_by('ingredient__name')
+        items = get_shopping_list_items(get_shopping_list_entries(user))
+    lines = {
+        (item['name'], item['measurement_unit']): item['amount']
+        for item in items
+    }
+    cache.add(
+        f'cart-summary:{user.pk}:{version}',
+        lines,
+        settings.CART_SUMMARY_CACHE_TIMEOUT
     )
+    previous = None
+    if since is not None and since <= version:
+        previous = cache.get(f'cart-summary:{user.pk}:{since}')
+    if previous is None:
+        return {'version': version, 'full': True, 'ingredients': items,
+                'removed': []}
+    return {
+        'version': version,
+        'full': False,
+        'ingredients': [
+            item for item in items
+            if previous.get((item['name'], item['measurement_unit']))
+            != item['amount']
+        ],
+        'removed': [
+            {'name': name, 'measurement_unit': unit}
+            for name, unit in previous
+            if (name, unit) not in lines
+        ],
+    }
 
+
+def get_shopping_list_context(user, start=None, end=None):
+    entries = get_shopping_list_entries(user, start, end)
     recipes = (
-        ShoppingCart.objects
-        .filter(user=user)
-        .select_related('recipe__author')
+        entries
         .values('recipe__name', 'recipe__author__username')
         .distinct()
     )
 
-    ingredients_for_template = [
-        {
-            'name': item['ingredient__name'],
-            'unit': item['ingredient__measurement_unit'],
-            'total': item['total']
-        }
-        for item in ingredients
-    ]
-
     months = {
         1: 'января', 2: 'февраля', 3: 'марта', 4: 'апреля',
         5: 'мая', 6: 'июня', 7: 'июля', 8: 'августа',
@@ -48,9 +176,51 @@ def generate_shopping_list(user):
     today = date.today()
     formatted_date = f"{today.day} {months[today.month]} {today.year} года"
 
-    content = render_to_string('shopping_list.txt', {
-        'ingredients': ingredients_for_template,
+    return {
+        'ingredients': get_shopping_list_items(entries),
         'recipes': list(recipes),
         'date': formatted_date
-    })
-    return content
+    }
+
+
+def generate_shopping_list(user, start=None, end=None):
+    from django.template.loader import render_to_string
+
+    return render_to_string(
+        'shopping_list.txt', get_shopping_list_context(user, start, end))
+
+
+def generate_shopping_list_pdf(user, start=None, end=None):
+    return render_shopping_list_pdf(
+        get_shopping_list_context(user, start, end))
+
+
+def export_shopping_list(user, file_type='txt', start=None, end=None):
+    version = get_user_model().objects.values_list(
+        'cart_version', flat=True).get(pk=user.pk)
+    name = f'{version}-{date.today()}'
+    if start is not None or end is not None:
+        name = f'{name}-plan-{start or ""}-{end or ""}'
+    name = f'shopping_lists/{user.pk}/{name}.{file_type}'
+    if private_storage.exists(name):
+        return name
+    if file_type == 'pdf':
+        content = generate_shopping_list_pdf(user, start, end)
+    else:
+        content = generate_shopping_list(user, start, end).encode()
+    return private_storage.save(name, ContentFile(content))
+
+
+def decode_avatar(avatar_base64):
+    return base64.b64decode(avatar_base64.split(',')[1])
+
+
+def save_avatar(user, avatar_data):
+    user.avatar.save(
+        f'avatar{user.id}.png', ContentFile(avatar_data), save=False)
+    user.save(update_fields=['avatar'])
+
+
+def stage_avatar_upload(user, avatar_data):
+    return private_storage.save(
+        f'avatar_uploads/{user.pk}.png', ContentFile(avatar_data))
@@ -0,0 +1,106 @@
+import os
+import string
+
+from django.conf import settings
+from django.core.cache import cache
+from foodgram.cache import LocalLRUCache
+from foodgram.singleflight import single_flight
+from jobs.models import Job
+from jobs.registry import enqueue
+
+from .models import Recipe
+
+ALPHABET = string.digits + string.ascii_letters
+BASE = len(ALPHABET)
+MAX_RECIPE_ID = 2 ** 63 - 1
+
+_local_cache = LocalLRUCache(
+    settings.SHORT_LINK_LRU_SIZE, settings.SHORT_LINK_LRU_TIMEOUT
+)
+
+
+def encode_short_code(recipe_id):
+    recipe_id = int(recipe_id)
+    if recipe_id < 0:
+        raise ValueError('Идентификатор рецепта не может быть отрицательным')
+    code = ''
+    while True:
+        recipe_id, remainder = divmod(recipe_id, BASE)
+        code = ALPHABET[remainder] + code
+        if not recipe_id:
+            return code
+
+
+def decode_short_code(code):
+    recipe_id = 0
+    for char in code:
+        index = ALPHABET.find(char)
+        if index < 0:
+            return None
+        recipe_id = recipe_id * BASE + index
+        if recipe_id > MAX_RECIPE_ID:
+            return None
+    return recipe_id
+
+
+def _cache_key(recipe_id):
+    return f'short-link:{recipe_id}'
+
+
+def _load_recipe_exists(recipe_id):
+    exists = Recipe.objects.filter(id=recipe_id).exists()
+    cache.set(
+        _cache_key(recipe_id),
+        exists,
+        settings.SHORT_LINK_CACHE_TIMEOUT if exists
+        else settings.SHORT_LINK_NEGATIVE_CACHE_TIMEOUT
+    )
+    return exists
+
+
+def recipe_exists(recipe_id):
+    key = _cache_key(recipe_id)
+    if _local_cache.get(key):
+        return True
+    exists = cache.get(key)
+    if exists is None:
+        exists = single_flight(key, lambda: _load_recipe_exists(recipe_id))
+    if exists:
+        _local_cache.set(key, True)
+    return exists
+
+
+def invalidate_recipe(recipe_id):
+    key = _cache_key(recipe_id)
+    _local_cache.delete(key)
+    cache.delete(key)
+
+
+def invalidate_recipes(recipe_ids):
+    keys = [_cache_key(recipe_id) for recipe_id in recipe_ids]
+    for key in keys:
+        _local_cache.delete(key)
+    cache.delete_many(keys)
+
+
+def get_short_link_map_lines():
+    recipe_ids = Recipe.objects.order_by('id').values_list('id', flat=True)
+    for recipe_id in recipe_ids.iterator():
+        yield f'/r/{encode_short_code(recipe_id)}/ /recipes/{recipe_id}/;\n'
+
+
+def export_short_link_map(filename):
+    tmp_filename = f'{filename}.tmp'
+    with open(tmp_filename, 'w', encoding='utf-8') as f:
+        f.writelines(get_short_link_map_lines())
+    os.replace(tmp_filename, filename)
+
+
+def schedule_short_link_export():
+    if not settings.SHORT_LINK_MAP_PATH:
+        return
+    pending = Job.objects.filter(
+        name='recipes.export_short_links', status=Job.PENDING)
+    if not pending.exists():
+        enqueue('recipes.export_short_links',
+                delay=settings.SHORT_LINK_EXPORT_DELAY)
@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from jobs.registry import enqueue
+
+from .feed import backfill_timeline, remove_from_timeline, update_fanout_mode
+from .models import (Ingredient, IngredientAmount, MealPlanEntry, Recipe,
+                     ShoppingCart, Subscribe, Tag)
+from .nutrition import schedule_nutrition_recompute
+from .services import (bump_cart_versions, invalidate_tag_catalog,
+                       schedule_cart_versions_bump)
+from .shortlinks import invalidate_recipe, schedule_short_link_export
+
+User = get_user_model()
+
+SHOPPING_LIST_RECIPE_FIELDS = {'name'}
+SHOPPING_LIST_AUTHOR_FIELDS = {'username'}
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_short_link(sender, instance, **kwargs):
+    invalidate_recipe(instance.id)
+
+
+@receiver(post_save, sender=Recipe)
+def export_short_links_on_recipe_change(sender, instance, created,
+                                        update_fields, **kwargs):
+    if created or (update_fields and 'deleted_at' in update_fields):
+        schedule_short_link_export()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tags(sender, **kwargs):
+    invalidate_tag_catalog()
+
+
+@receiver(post_save, sender=ShoppingCart)
+@receiver(post_delete, sender=ShoppingCart)
+@receiver(post_save, sender=MealPlanEntry)
+@receiver(post_delete, sender=MealPlanEntry)
+def bump_cart_version(sender, instance, **kwargs):
+    bump_cart_versions(User.objects.filter(pk=instance.user_id))
+
+
+@receiver(post_save, sender=IngredientAmount)
+@receiver(post_delete, sender=IngredientAmount)
+def bump_cart_versions_on_amount_change(sender, instance, **kwargs):
+    schedule_cart_versions_bump([instance.recipe_id])
+
+
+@receiver(post_save, sender=IngredientAmount)
+@receiver(post_delete, sender=IngredientAmount)
+def recompute_nutrition_on_amount_change(sender, instance, **kwargs):
+    schedule_nutrition_recompute([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def recompute_nutrition_on_ingredient_change(sender, instance, created,
+                                             **kwargs):
+    if not created:
+        enqueue('recipes.nutrition', {'ingredient_ids': [instance.id]})
+
+
+@receiver(post_save, sender=Recipe)
+def bump_cart_versions_on_recipe_change(sender, instance, created,
+                                        update_fields, **kwargs):
+    if created:
+        return
+    if update_fields and not SHOPPING_LIST_RECIPE_FIELDS & set(update_fields):
+        return
+    schedule_cart_versions_bump([instance.id])
+
+
+@receiver(post_save, sender=User)
+def bump_cart_versions_on_author_change(sender, instance, created,
+                                        update_fields, **kwargs):
+    if created:
+        return
+    if update_fields and not SHOPPING_LIST_AUTHOR_FIELDS & set(update_fields):
+        return
+    schedule_cart_versions_bump(
+        Recipe.objects.filter(author=instance).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Ingredient)
+def bump_cart_versions_on_ingredient_change(sender, instance, created,
+                                            **kwargs):
+    if created:
+        return
+    bump_cart_versions(User.objects.filter(
+        Q(shoppingcarts__recipe__recipe_amounts__ingredient=instance)
+        | Q(meal_plan__recipe__recipe_amounts__ingredient=instance)
+    ))
+
+
+def schedule_media_delete(name):
+    if name:
+        enqueue('media.delete', {'name': name},
+                delay=settings.MEDIA_CLEANUP_GRACE_PERIOD)
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Recipe)
+def delete_replaced_media(sender, instance, update_fields=None, **kwargs):
+    field = 'avatar' if sender is User else 'image'
+    if instance.pk is None:
+        return
+    if update_fields is not None and field not in update_fields:
+        return
+    previous = (
+        sender.all_objects
+        .filter(pk=instance.pk)
+        .values_list(field, flat=True)
+        .first()
+    )
+    if previous != getattr(instance, field).name:
+        schedule_media_delete(previous)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Recipe)
+def delete_removed_media(sender, instance, **kwargs):
+    field = 'avatar' if sender is User else 'image'
+    schedule_media_delete(getattr(instance, field).name)
+
+
+@receiver(post_save, sender=Recipe)
+def fan_out_new_recipe(sender, instance, created, **kwargs):
+    if created:
+        enqueue('feed.fanout', {'recipe_id': instance.id})
+
+
+@receiver(post_save, sender=Subscribe)
+def backfill_subscription(sender, instance, created, **kwargs):
+    if not created:
+        return
+    if not User.objects.filter(
+            pk=instance.following_id, fanout_on_read=True).exists():
+        backfill_timeline([instance.follower_id], instance.following_id)
+    update_fanout_mode(instance.following_id)
+
+
+@receiver(post_delete, sender=Subscribe)
+def clear_subscription_timeline(sender, instance, **kwargs):
+    remove_from_timeline(instance.follower_id, instance.following_id)
+    if update_fanout_mode(instance.following_id):
+        enqueue('feed.backfill_author', {'author_id': instance.following_id})
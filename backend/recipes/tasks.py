@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from foodgram.storage import private_storage
+from jobs.registry import task
+
+from .deletion import purge_deleted
+from .feed import backfill_timeline, fan_out_recipe
+from .media import (delete_orphaned_media, delete_stale_exports,
+                    is_media_referenced)
+from .models import IngredientAmount, Recipe, Subscribe
+from .nutrition import recompute_nutrition
+from .services import export_shopping_list, generate_shopping_list, save_avatar
+from .shortlinks import export_short_link_map
+
+User = get_user_model()
+
+
+@task('users.save_avatar')
+def save_avatar_task(user_id, path):
+    user = User.objects.get(pk=user_id)
+    with private_storage.open(path) as upload:
+        save_avatar(user, upload.read())
+    private_storage.delete(path)
+    return {'avatar': user.avatar.url}
+
+
+@task('media.delete')
+def delete_media_task(name):
+    if not is_media_referenced(name):
+        default_storage.delete(name)
+
+
+@task('media.cleanup')
+def cleanup_media_task():
+    return {
+        'media': delete_orphaned_media(),
+        'exports': delete_stale_exports(),
+    }
+
+
+@task('recipes.export_short_links')
+def export_short_links_task():
+    if settings.SHORT_LINK_MAP_PATH:
+        export_short_link_map(settings.SHORT_LINK_MAP_PATH)
+
+
+@task('recipes.shopping_list')
+def shopping_list_task(user_id, start=None, end=None, file_type='txt'):
+    user = User.objects.get(pk=user_id)
+    if file_type == 'pdf':
+        return {
+            'file': export_shopping_list(user, file_type, start, end),
+            'filename': 'shopping_list.pdf',
+        }
+    return {'content': generate_shopping_list(user, start, end)}
+
+
+@task('feed.fanout')
+def fan_out_recipe_task(recipe_id):
+    return {'entries': fan_out_recipe(recipe_id)}
+
+
+@task('feed.backfill_author')
+def backfill_author_task(author_id):
+    backfill_timeline(
+        Subscribe.objects.filter(following_id=author_id)
+        .values_list('follower_id', flat=True),
+        author_id,
+    )
+
+
+@task('recipes.nutrition')
+def recompute_nutrition_task(ingredient_ids=None):
+    recipes = Recipe.objects.all()
+    if ingredient_ids is not None:
+        recipes = recipes.filter(id__in=IngredientAmount.objects.filter(
+            ingredient_id__in=ingredient_ids).values('recipe_id'))
+    return {'recipes': recompute_nutrition(
+        recipes.order_by('id').values_list('id', flat=True))}
+
+
+@task('deletion.purge')
+def purge_deleted_task():
+    return purge_deleted()
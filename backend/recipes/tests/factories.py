@@ -0,0 +1,43 @@
+import base64
+import io
+
+from django.contrib.auth import get_user_model
+from PIL import Image
+from recipes.models import IngredientAmount, Recipe
+
+User = get_user_model()
+
+PASSWORD = 'pass12345!x'
+
+
+def create_user(username, **fields):
+    return User.objects.create_user(
+        email=f'{username}@example.com',
+        username=username,
+        password=PASSWORD,
+        **fields
+    )
+
+
+def create_recipe(author, name='Рецепт', ingredients=(), tags=(), **fields):
+    fields.setdefault('image', 'recipes/images/test.png')
+    recipe = Recipe.objects.create(
+        author=author,
+        name=name,
+        text='Описание',
+        cooking_time=10,
+        **fields
+    )
+    IngredientAmount.objects.bulk_create(
+        IngredientAmount(recipe=recipe, ingredient=ingredient, amount=amount)
+        for ingredient, amount in ingredients
+    )
+    recipe.tags.set(tags)
+    return recipe
+
+
+def image_data():
+    buffer = io.BytesIO()
+    Image.new('RGB', (2, 2), 'red').save(buffer, 'PNG')
+    return ('data:image/png;base64,'
+            + base64.b64encode(buffer.getvalue()).decode())
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from recipes.models import Favorite, Ingredient, Subscribe, Tag
+from recipes.tests.factories import create_recipe, create_user
+
+CHANGELISTS = (
+    '/admin/recipes/recipe/',
+    '/admin/recipes/userprofile/',
+    '/admin/recipes/ingredient/',
+    '/admin/recipes/tag/',
+    '/admin/recipes/favorite/',
+    '/admin/recipes/shoppingcart/',
+    '/admin/recipes/subscribe/',
+)
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('admin', is_staff=True, is_superuser=True)
+        cls.tag = Tag.objects.create(name='Обед', slug='lunch')
+        cls.ingredient = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_rows(self, index):
+        author = create_user(f'author{index}')
+        recipe = create_recipe(
+            author, name=f'Рецепт {index}',
+            ingredients=[(self.ingredient, 100)], tags=[self.tag])
+        Favorite.objects.create(user=self.admin, recipe=recipe)
+        Subscribe.objects.create(follower=self.admin, following=author)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(0)
+        counts = {url: self.count_queries(url) for url in CHANGELISTS}
+        for index in range(1, 4):
+            self.add_rows(index)
+        for url, count in counts.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url), count)
+
+    def test_annotated_counts(self):
+        self.add_rows(0)
+        self.add_rows(1)
+        response = self.client.get('/admin/recipes/userprofile/')
+        for user in response.context['cl'].result_list:
+            self.assertEqual(user.subscriptions_count, user.authors.count())
+            self.assertEqual(user.subscribers_count, user.followers.count())
+            self.assertEqual(user.recipes_count, user.recipes.count())
+        response = self.client.get('/admin/recipes/tag/?o=4')
+        self.assertEqual(
+            response.context['cl'].result_list[0].recipes_count, 2)
+        response = self.client.get('/admin/recipes/recipe/')
+        self.assertEqual(
+            [recipe.favorites_count
+             for recipe in response.context['cl'].result_list],
+            [1, 1])
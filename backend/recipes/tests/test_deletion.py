@@ -0,0 +1,140 @@
+import shutil
+import tempfile
+
+from api.relations import UserRelations
+from changes.models import Change
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from jobs.models import Job
+from recipes.deletion import purge_deleted, tombstone_recipe, tombstone_user
+from recipes.media import delete_orphaned_media, is_media_referenced
+from recipes.models import (Favorite, Ingredient, IngredientAmount, Recipe,
+                            ShoppingCart, Subscribe, Tag)
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class DeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.author = create_user('author')
+        cls.tag = Tag.objects.create(name='Обед', slug='lunch')
+        cls.ingredient = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+        cls.recipe = create_recipe(
+            cls.author, ingredients=[(cls.ingredient, 100)], tags=[cls.tag])
+        cls.other = create_recipe(cls.user, name='Другой')
+        Favorite.objects.create(user=cls.user, recipe=cls.recipe)
+        ShoppingCart.objects.create(user=cls.user, recipe=cls.recipe)
+        Subscribe.objects.create(follower=cls.user, following=cls.author)
+        Subscribe.objects.create(follower=cls.author, following=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_deleted_recipe_is_hidden_until_purged(self):
+        self.client.force_authenticate(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/recipes/{self.recipe.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Recipe.objects.filter(id=self.recipe.id).exists())
+        self.assertTrue(
+            Recipe.all_objects.filter(id=self.recipe.id).exists())
+        self.assertEqual(
+            Job.objects.filter(
+                name='deletion.purge', status=Job.PENDING).count(), 1)
+        response = self.client.get(f'/api/recipes/{self.recipe.id}/')
+        self.assertEqual(response.status_code, 404)
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/recipes/?is_favorited=1')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_purge_removes_recipe_and_dependents(self):
+        self.client.force_authenticate(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/recipes/{self.recipe.id}/')
+        purged = purge_deleted(batch_size=1, delay=0)
+        self.assertEqual(purged['recipes'], 1)
+        self.assertEqual(purged['users'], 0)
+        self.assertFalse(
+            Recipe.all_objects.filter(id=self.recipe.id).exists())
+        for model in (Favorite, ShoppingCart, IngredientAmount):
+            self.assertFalse(
+                model.objects.filter(recipe_id=self.recipe.id).exists())
+        self.assertFalse(
+            Recipe.tags.through.objects.filter(
+                recipe_id=self.recipe.id).exists())
+        self.assertTrue(
+            Change.objects.filter(
+                model='recipes.favorite', action=Change.DELETE).exists())
+        self.assertTrue(Recipe.objects.filter(id=self.other.id).exists())
+        self.assertEqual(purge_deleted(delay=0)['recipes'], 0)
+
+    def test_tombstoned_user_is_purged_with_recipes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tombstone_user(self.author)
+        self.assertFalse(User.objects.filter(id=self.author.id).exists())
+        self.assertFalse(
+            User.all_objects.get(id=self.author.id).is_active)
+        self.assertFalse(Recipe.objects.filter(author=self.author).exists())
+        purged = purge_deleted(batch_size=1, delay=0)
+        self.assertEqual(purged['recipes'], 1)
+        self.assertEqual(purged['users'], 1)
+        self.assertFalse(
+            User.all_objects.filter(id=self.author.id).exists())
+        self.assertFalse(
+            Recipe.all_objects.filter(id=self.recipe.id).exists())
+        self.assertFalse(Subscribe.objects.exists())
+        self.assertFalse(Favorite.objects.exists())
+        self.assertTrue(User.objects.filter(id=self.user.id).exists())
+        self.assertTrue(Recipe.objects.filter(id=self.other.id).exists())
+
+    @override_settings(USER_RELATIONS_CACHE_TIMEOUT=300)
+    def test_purge_invalidates_cached_relations(self):
+        self.assertEqual(
+            UserRelations(self.user.id).favorite_ids, {self.recipe.id})
+        self.assertEqual(
+            UserRelations(self.user.id).shopping_cart_ids, {self.recipe.id})
+        self.assertEqual(
+            UserRelations(self.author.id).subscription_ids, {self.user.id})
+        with self.captureOnCommitCallbacks(execute=True):
+            tombstone_recipe(self.recipe)
+            tombstone_user(self.user)
+        purge_deleted(delay=0)
+        relations = UserRelations(self.user.id)
+        self.assertEqual(relations.favorite_ids, frozenset())
+        self.assertEqual(relations.shopping_cart_ids, frozenset())
+        self.assertEqual(
+            UserRelations(self.author.id).subscription_ids, frozenset())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TombstonedMediaTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_tombstoned_images_are_kept_until_purge(self):
+        name = default_storage.save(
+            'recipes/images/cake.png', ContentFile(b'image'))
+        recipe = create_recipe(create_user('author'))
+        Recipe.objects.filter(id=recipe.id).update(image=name)
+        recipe.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            tombstone_recipe(recipe)
+        self.assertTrue(is_media_referenced(name))
+        self.assertEqual(delete_orphaned_media(grace_period=0), [])
+        self.assertTrue(default_storage.exists(name))
+        purge_deleted(delay=0)
+        self.assertFalse(is_media_referenced(name))
+        self.assertEqual(delete_orphaned_media(grace_period=0), [name])
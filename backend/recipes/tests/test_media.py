@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils.functional import empty
+from foodgram.storage import private_storage
+from jobs.models import Job
+from jobs.registry import claim_job, run_job, schedule_periodic_jobs
+from recipes.models import Recipe
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT,
+                   PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT)
+class MediaTests(TestCase):
+    def setUp(self):
+        private_storage._wrapped = empty
+        self.addCleanup(setattr, private_storage, '_wrapped', empty)
+        self.addCleanup(shutil.rmtree, MEDIA_ROOT, True)
+        self.addCleanup(shutil.rmtree, PRIVATE_MEDIA_ROOT, True)
+
+    @override_settings(MEDIA_CLEANUP_GRACE_PERIOD=0,
+                       SHOPPING_LIST_EXPORT_MAX_AGE=0)
+    def test_worker_schedules_media_cleanup(self):
+        orphan = default_storage.save(
+            'recipes/images/orphan.png', ContentFile(b'orphan'))
+        used = default_storage.save(
+            'recipes/images/used.png', ContentFile(b'used'))
+        recipe = create_recipe(create_user('author'))
+        Recipe.objects.filter(id=recipe.id).update(image=used)
+        export = private_storage.save(
+            'shopping_lists/1/1-2026-01-01.txt', ContentFile(b'list'))
+        self.assertIn(
+            'media.cleanup', [job.name for job in schedule_periodic_jobs()])
+        while (job := claim_job('worker')) is not None:
+            run_job(job)
+        job = Job.objects.get(name='media.cleanup')
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(
+            job.result, {'media': [orphan], 'exports': [export]})
+        self.assertTrue(default_storage.exists(used))
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertFalse(private_storage.exists(export))
+
+    def test_identical_uploads_share_one_file(self):
+        first = default_storage.save(
+            'recipes/images/first.PNG', ContentFile(b'image'))
+        second = default_storage.save(
+            'recipes/images/second.png', ContentFile(b'image'))
+        other = default_storage.save(
+            'recipes/images/first.png', ContentFile(b'other'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r'^recipes/images/[0-9a-f]{20}\.png$')
+        _, files = default_storage.listdir('recipes/images')
+        self.assertEqual(len(files), 2)
+
+    @override_settings(MEDIA_CLEANUP_GRACE_PERIOD=0)
+    def test_shared_file_survives_replacement(self):
+        image = default_storage.save(
+            'recipes/images/shared.png', ContentFile(b'shared'))
+        author = create_user('author')
+        recipes = [create_recipe(author, image=image) for _ in range(2)]
+        recipes[0].image = default_storage.save(
+            'recipes/images/new.png', ContentFile(b'new'))
+        recipes[0].save()
+        while (job := claim_job('worker')) is not None:
+            run_job(job)
+        self.assertTrue(default_storage.exists(image))
+        recipes[1].image = recipes[0].image.name
+        recipes[1].save()
+        while (job := claim_job('worker')) is not None:
+            run_job(job)
+        self.assertFalse(default_storage.exists(image))
+
+    @override_settings(USE_X_ACCEL_REDIRECT=True)
+    def test_private_download_is_delegated_to_nginx(self):
+        user = create_user('user')
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/recipes/download_shopping_cart/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertRegex(
+            response['X-Accel-Redirect'],
+            rf'^/protected/shopping_lists/{user.pk}/[^/]+\.txt$')
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="shopping_list.txt"')
+        self.assertTrue(private_storage.exists(
+            response['X-Accel-Redirect'][len('/protected/'):]))
@@ -0,0 +1,33 @@
+from django.test import TestCase
+from recipes.models import Ingredient
+from recipes.nutrition import compute_nutrition
+from recipes.tests.factories import create_recipe, create_user
+
+
+class ComputeNutritionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author')
+        cls.flour = Ingredient.objects.create(
+            name='Мука', measurement_unit='г',
+            calories=364, proteins=10, fats=1, carbohydrates=76)
+        cls.milk = Ingredient.objects.create(
+            name='Молоко', measurement_unit='л', density=1.03,
+            calories=60, proteins=3, fats=3.2, carbohydrates=4.7)
+        cls.salt = Ingredient.objects.create(
+            name='Соль', measurement_unit='г')
+
+    def test_compute_nutrition_converts_units(self):
+        recipe = create_recipe(
+            self.author, ingredients=[(self.flour, 200), (self.milk, 1)])
+        totals = compute_nutrition([recipe.id])[recipe.id]
+        self.assertAlmostEqual(totals['calories'], 364 * 2 + 60 * 10.3)
+        self.assertAlmostEqual(totals['proteins'], 10 * 2 + 3 * 10.3)
+
+    def test_missing_values_make_totals_unknown(self):
+        recipe = create_recipe(
+            self.author, ingredients=[(self.flour, 200), (self.salt, 5)])
+        empty = create_recipe(self.author, name='Пустой')
+        totals = compute_nutrition([recipe.id, empty.id])
+        self.assertIsNone(totals[recipe.id]['calories'])
+        self.assertIsNone(totals[empty.id]['calories'])
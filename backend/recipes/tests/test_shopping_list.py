@@ -0,0 +1,107 @@
+import re
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.functional import empty
+from foodgram.storage import private_storage
+from recipes.models import Ingredient, ShoppingCart
+from recipes.pdf import (FONT_NAME, get_layout, render_shopping_list_pdf,
+                         wrap_line)
+from recipes.services import export_shopping_list
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT)
+class ShoppingListExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        cls.author = create_user('author')
+        cls.flour = Ingredient.objects.create(
+            name='Мука', measurement_unit='г')
+        cls.recipe = create_recipe(
+            cls.author, name='Хлеб', ingredients=[(cls.flour, 500)])
+        ShoppingCart.objects.create(user=cls.user, recipe=cls.recipe)
+
+    def setUp(self):
+        private_storage._wrapped = empty
+        self.addCleanup(setattr, private_storage, '_wrapped', empty)
+        self.addCleanup(shutil.rmtree, PRIVATE_MEDIA_ROOT, True)
+
+    def export(self):
+        with private_storage.open(export_shopping_list(self.user)) as f:
+            return f.read().decode()
+
+    def test_export_is_reused_until_cart_changes(self):
+        name = export_shopping_list(self.user)
+        self.assertEqual(export_shopping_list(self.user), name)
+        with self.captureOnCommitCallbacks(execute=True):
+            amount = self.recipe.recipe_amounts.get()
+            amount.amount = 700
+            amount.save()
+        self.assertNotEqual(export_shopping_list(self.user), name)
+
+    def test_renames_refresh_export(self):
+        self.assertIn('Хлеб @author', self.export())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.name = 'Батон'
+            self.recipe.save()
+        self.assertIn('Батон @author', self.export())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.username = 'baker'
+            self.author.save()
+        self.assertIn('Батон @baker', self.export())
+        self.flour.name = 'Мука пшеничная'
+        self.flour.save()
+        self.assertIn('Мука пшеничная', self.export())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.last_name = 'Пекарь'
+            self.author.save(update_fields=['last_name'])
+        self.assertIn('Мука пшеничная', self.export())
+
+    def test_pdf_export(self):
+        name = export_shopping_list(self.user, 'pdf')
+        self.assertTrue(name.endswith('.pdf'))
+        self.assertEqual(export_shopping_list(self.user, 'pdf'), name)
+        self.assertNotEqual(export_shopping_list(self.user), name)
+        with private_storage.open(name) as f:
+            self.assertTrue(f.read().startswith(b'%PDF'))
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/recipes/download_shopping_cart/?type=pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('shopping_list.pdf', response['Content-Disposition'])
+
+
+class ShoppingListPdfTests(SimpleTestCase):
+    def render(self, count):
+        return render_shopping_list_pdf({
+            'date': '2024-01-02',
+            'ingredients': [
+                {'name': 'мука ' * 40, 'amount': 1, 'measurement_unit': 'г'}
+            ] * count,
+            'recipes': [
+                {'recipe__name': 'Хлеб', 'recipe__author__username': 'author'}
+            ],
+        })
+
+    def test_long_lines_are_wrapped(self):
+        layout = get_layout()
+        lines = wrap_line('мука ' * 40, layout, FONT_NAME, indent=10)
+        self.assertGreater(len(lines), 1)
+        for line in lines:
+            self.assertLessEqual(
+                layout['string_width'](line, FONT_NAME, layout['font_size']),
+                layout['width'] - 10)
+
+    def count_pages(self, content):
+        return int(re.search(rb'/Count (\d+)', content).group(1))
+
+    def test_long_lists_continue_on_new_pages(self):
+        self.assertEqual(self.count_pages(self.render(1)), 1)
+        self.assertGreater(self.count_pages(self.render(80)), 1)
@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from jobs.models import Job
+from jobs.registry import claim_job, run_job
+from recipes.deletion import tombstone_recipe
+from recipes.shortlinks import (MAX_RECIPE_ID, decode_short_code,
+                                encode_short_code)
+from recipes.tests.factories import create_recipe, create_user
+from rest_framework.test import APIClient
+
+
+class ShortCodeTests(TestCase):
+    def test_round_trip(self):
+        for recipe_id in (0, 1, 61, 62, 3843, MAX_RECIPE_ID):
+            self.assertEqual(
+                decode_short_code(encode_short_code(recipe_id)), recipe_id)
+
+    def test_invalid_codes(self):
+        self.assertIsNone(decode_short_code('a-b'))
+        self.assertIsNone(decode_short_code('z' * 12))
+
+
+class ShortLinkRedirectTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = create_user('author')
+        cls.recipe = create_recipe(author, id=62)
+        cls.other = create_recipe(author, id=10)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_get_link_returns_base62_route(self):
+        response = self.client.get(f'/api/recipes/{self.recipe.id}/get-link/')
+        self.assertEqual(
+            response.data['short-link'], 'http://testserver/r/10/')
+
+    def test_base62_and_legacy_routes(self):
+        response = self.client.get('/r/10/')
+        self.assertRedirects(
+            response, '/recipes/62/', fetch_redirect_response=False)
+        response = self.client.get('/s/10/')
+        self.assertRedirects(
+            response, '/recipes/10/', fetch_redirect_response=False)
+
+    def test_missing_recipe(self):
+        self.assertEqual(self.client.get('/r/zz/').status_code, 404)
+        self.assertEqual(self.client.get('/s/404/').status_code, 404)
+        self.assertEqual(
+            self.client.get(f'/s/{MAX_RECIPE_ID + 1}/').status_code, 404)
+
+    def test_deleted_recipe(self):
+        self.assertEqual(self.client.get('/r/10/').status_code, 302)
+        self.client.force_authenticate(self.recipe.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/recipes/{self.recipe.id}/')
+        self.assertEqual(self.client.get('/r/10/').status_code, 404)
+
+    def test_export_map(self):
+        stdout = io.StringIO()
+        call_command('export_short_links', stdout=stdout)
+        self.assertEqual(stdout.getvalue().splitlines(), [
+            '/r/a/ /recipes/10/;',
+            '/r/10/ /recipes/62/;',
+        ])
+
+
+MAP_PATH = os.path.join(tempfile.mkdtemp(), 'recipes.map')
+
+
+@override_settings(SHORT_LINK_MAP_PATH=MAP_PATH, SHORT_LINK_EXPORT_DELAY=0)
+class ShortLinkMapExportTests(TestCase):
+    def export(self):
+        jobs = Job.objects.filter(name='recipes.export_short_links')
+        self.assertEqual(jobs.filter(status=Job.PENDING).count(), 1)
+        while (job := claim_job('worker')) is not None:
+            if job.name == 'recipes.export_short_links':
+                run_job(job)
+        with open(MAP_PATH, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_map_follows_created_and_deleted_recipes(self):
+        author = create_user('author')
+        recipe = create_recipe(author, id=62)
+        create_recipe(author, id=10)
+        self.assertEqual(
+            self.export(), ['/r/a/ /recipes/10/;', '/r/10/ /recipes/62/;'])
+        tombstone_recipe(recipe)
+        self.assertEqual(self.export(), ['/r/a/ /recipes/10/;'])
+
+    @override_settings(SHORT_LINK_MAP_PATH='')
+    def test_export_disabled_without_path(self):
+        create_recipe(create_user('author'))
+        self.assertFalse(
+            Job.objects.filter(name='recipes.export_short_links').exists())
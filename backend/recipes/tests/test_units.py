@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+from recipes.models import Ingredient, ShoppingCart
+from recipes.services import get_shopping_list_entries, get_shopping_list_items
+from recipes.tests.factories import create_recipe, create_user
+from recipes.units import humanize_amount, to_canonical
+
+
+class UnitConversionTests(SimpleTestCase):
+    def test_to_canonical(self):
+        self.assertEqual(to_canonical(2, 'кг'), (2000, 'г'))
+        self.assertEqual(to_canonical(3, 'ст. л.'), (45, 'мл'))
+        self.assertEqual(to_canonical(2, 'стакан', density=0.5), (250, 'г'))
+        self.assertEqual(to_canonical(100, 'г', density=0.5), (100, 'г'))
+        self.assertEqual(to_canonical(3, 'шт'), (3, 'шт'))
+
+    def test_humanize_amount(self):
+        self.assertEqual(humanize_amount(1500.0, 'г'), (Decimal('1.5'), 'кг'))
+        self.assertEqual(humanize_amount(2000.0, 'мл'), (2, 'л'))
+        self.assertEqual(humanize_amount(999.0, 'г'), (999, 'г'))
+        self.assertEqual(
+            humanize_amount(0.1 + 0.2, 'г'), (Decimal('0.3'), 'г'))
+        self.assertEqual(humanize_amount(1500, 'шт'), (1500, 'шт'))
+
+
+class ShoppingListUnitsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user')
+        author = create_user('author')
+        ingredients = [
+            (Ingredient.objects.create(name='Мука', measurement_unit='г'),
+             500),
+            (Ingredient.objects.create(name='Мука', measurement_unit='кг'),
+             1),
+            (Ingredient.objects.create(name='Мука', measurement_unit='шт'),
+             2),
+            (Ingredient.objects.create(name='Молоко', measurement_unit='л'),
+             1),
+            (Ingredient.objects.create(
+                name='Молоко', measurement_unit='стакан'), 1),
+            (Ingredient.objects.create(
+                name='Сироп', measurement_unit='ст. л.', density=1.4), 2),
+            (Ingredient.objects.create(name='Сироп', measurement_unit='г'),
+             58),
+        ]
+        for name, part in (('Хлеб', ingredients[:4]),
+                           ('Блины', ingredients[4:])):
+            recipe = create_recipe(author, name=name, ingredients=part)
+            ShoppingCart.objects.create(user=cls.user, recipe=recipe)
+
+    def test_amounts_are_summed_in_canonical_units(self):
+        items = get_shopping_list_items(get_shopping_list_entries(self.user))
+        self.assertEqual(
+            [(item['name'], item['amount'], item['measurement_unit'])
+             for item in items],
+            [
+                ('Молоко', Decimal('1.25'), 'л'),
+                ('Мука', Decimal('1.5'), 'кг'),
+                ('Мука', 2, 'шт'),
+                ('Сироп', 100, 'г'),
+            ],
+        )
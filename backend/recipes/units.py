@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+GRAM = 'г'
+MILLILITER = 'мл'
+
+UNITS = {
+    'мг': (GRAM, 0.001),
+    'г': (GRAM, 1),
+    'кг': (GRAM, 1000),
+    'мл': (MILLILITER, 1),
+    'л': (MILLILITER, 1000),
+    'капля': (MILLILITER, 0.05),
+    'ч. л.': (MILLILITER, 5),
+    'ст. л.': (MILLILITER, 15),
+    'стакан': (MILLILITER, 250),
+}
+VOLUME_UNITS = [
+    unit for unit, (canonical, _) in UNITS.items() if canonical == MILLILITER
+]
+LARGER_UNITS = {
+    GRAM: ('кг', 1000),
+    MILLILITER: ('л', 1000),
+}
+
+
+def canonical_amount_annotations(prefix=''):
+    unit_field = f'{prefix}measurement_unit'
+    density_field = f'{prefix}density'
+    has_density = Q(**{
+        f'{unit_field}__in': VOLUME_UNITS,
+        f'{density_field}__isnull': False,
+    })
+    return {
+        'canonical_unit': Case(
+            When(has_density, then=Value(GRAM)),
+            *(
+                When(**{unit_field: unit}, then=Value(canonical))
+                for unit, (canonical, _) in UNITS.items()
+            ),
+            default=F(unit_field),
+        ),
+        'unit_factor': Case(
+            *(
+                When(**{unit_field: unit}, then=Value(factor))
+                for unit, (_, factor) in UNITS.items()
+            ),
+            default=Value(1.0),
+            output_field=FloatField(),
+        ),
+        'density_factor': Case(
+            When(has_density, then=F(density_field)),
+            default=Value(1.0),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def to_canonical(amount, unit, density=None):
+    canonical, factor = UNITS.get(unit, (unit, 1))
+    amount = amount * factor
+    if canonical == MILLILITER and density is not None:
+        return amount * density, GRAM
+    return amount, canonical
+
+
+def humanize_amount(amount, unit):
+    amount = Decimal(str(amount))
+    larger_unit, ratio = LARGER_UNITS.get(unit, (None, None))
+    if larger_unit and amount >= ratio:
+        amount, unit = amount / ratio, larger_unit
+    amount = amount.quantize(Decimal('0.01')).normalize()
+    return (int(amount) if amount == amount.to_integral() else amount), unit
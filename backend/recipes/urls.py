@@ -1,11 +1,16 @@
 from django.urls import path
 
-from .views import RecipeShortLinkRedirectView
+from .views import (LegacyRecipeShortLinkRedirectView,
+                    RecipeShortLinkRedirectView)
 
 app_name = 'recipes'
 urlpatterns = [
     path(
-        's/<int:recipe_id>/',
+        'r/<str:code>/',
         RecipeShortLinkRedirectView.as_view(),
         name='recipe-short-link'),
+    path(
+        's/<int:code>/',
+        LegacyRecipeShortLinkRedirectView.as_view(),
+        name='recipe-legacy-short-link'),
 ]
@@ -1,12 +1,25 @@
 from django.http import Http404
 from django.shortcuts import redirect
-from django.views import View
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
 
-from .models import Recipe
+from .shortlinks import MAX_RECIPE_ID, decode_short_code, recipe_exists
 
 
-class RecipeShortLinkRedirectView(View):
-    def get(self, request, recipe_id):
-        if not Recipe.objects.filter(id=recipe_id).exists():
-            raise Http404(f"Рецепт с ID {recipe_id} не существует")
+class RecipeShortLinkRedirectView(APIView):
+    permission_classes = (AllowAny,)
+    throttle_scope = 'short_links'
+
+    def get_recipe_id(self, code):
+        return decode_short_code(code)
+
+    def get(self, request, code):
+        recipe_id = self.get_recipe_id(code)
+        if recipe_id is None or not recipe_exists(recipe_id):
+            raise Http404(f"Рецепт с кодом {code} не существует")
         return redirect(f'/recipes/{recipe_id}/')
+
+
+class LegacyRecipeShortLinkRedirectView(RecipeShortLinkRedirectView):
+    def get_recipe_id(self, code):
+        return code if code <= MAX_RECIPE_ID else None
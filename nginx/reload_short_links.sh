@@ -0,0 +1,17 @@
+#!/bin/sh
+# Перезагружает nginx, когда backend перевыгружает карту коротких ссылок.
+maps=/etc/nginx/short_links
+interval=${SHORT_LINK_RELOAD_INTERVAL:-30}
+checksum() {
+    cat "$maps"/*.map 2>/dev/null | md5sum
+}
+(
+    previous=$(checksum)
+    while sleep "$interval"; do
+        current=$(checksum)
+        if [ "$current" != "$previous" ]; then
+            nginx -s reload
+            previous=$current
+        fi
+    done
+) &